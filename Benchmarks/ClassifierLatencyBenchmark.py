@@ -0,0 +1,73 @@
+# Fit and predict latency of every ML Lab classifier, using the same engines and split as the page.
+# Predict latency is reported for the whole test split and for a single specimen.
+# Run from the project root:  python -m Benchmarks.ClassifierLatencyBenchmark
+import argparse
+import time
+
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+
+from Services.CategoricalCodec import CategoricalCodec
+from Services.ChunkedIngest import infer_target
+from Services.FastSvm import ApproximateSVC
+from Services.LowLatencyModels import is_categorical, knn, naive_bayes
+
+DATASETS = ["datasets/mushrooms.csv", "datasets/mushroom_cleaned.csv"]
+
+
+def engines(categorical, category_counts):
+    return [
+        ("Logistic Regression", LogisticRegression, dict(C=1.0, max_iter=100, solver='liblinear')),
+        ("Random Forest", RandomForestClassifier, dict(n_estimators=100, max_depth=10, n_jobs=-1)),
+        ("SVM (exact)", SVC, dict(C=1.0, kernel='rbf', gamma='scale', probability=True)),
+        ("SVM (approximate)", ApproximateSVC, dict(C=1.0, kernel='rbf', gamma='scale')),
+        ("Decision Tree", DecisionTreeClassifier, dict(max_depth=10)),
+        ("KNN", *knn(5, categorical)),
+        ("Naive Bayes", *naive_bayes(categorical, category_counts)),
+    ]
+
+
+def timed(func, *args, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fit and predict latency of the ML Lab classifiers")
+    parser.add_argument("--max-rows", type=int, default=None)
+    parser.add_argument("--skip", nargs="*", default=[], help="engine names to leave out, e.g. 'SVM (exact)'")
+    args = parser.parse_args()
+
+    for path in DATASETS:
+        frame = pd.read_csv(path, nrows=args.max_rows)
+        target, _ = infer_target(frame.columns)
+        codec = CategoricalCodec()
+        encoded = codec.fit_transform(frame)
+        x, y = encoded.drop(columns=[target]), encoded[target]
+        x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.3, random_state=0)
+        categorical = is_categorical(frame.drop(columns=[target]))
+        counts = [len(codec.vocabularies[col]) for col in x.columns]
+
+        print(f"{path}: {len(x_train):,} train / {len(x_test):,} test rows ({'categorical' if categorical else 'numeric'})")
+        print(f"  {'classifier':<22}{'fit ms':>10}{'predict ms':>12}{'1 row ms':>10}{'acc':>8}")
+        for name, estimator, params in engines(categorical, counts):
+            if name in args.skip:
+                continue
+            model, fit_seconds = timed(lambda: estimator(**params).fit(x_train, y_train))
+            predictions, predict_seconds = timed(model.predict, x_test, repeat=3)
+            _, row_seconds = timed(model.predict, x_test.iloc[:1], repeat=20)
+            print(f"  {name:<22}{fit_seconds * 1000:>10.1f}{predict_seconds * 1000:>12.1f}"
+                  f"{row_seconds * 1000:>10.2f}{accuracy_score(y_test, predictions):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
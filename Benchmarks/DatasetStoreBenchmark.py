@@ -0,0 +1,69 @@
+# Compare load time and resident memory of the CSV path against the columnar store.
+# Every measurement runs in a fresh interpreter so page-cache and allocator state do not leak between them.
+# Run from the project root:  python -m Benchmarks.DatasetStoreBenchmark
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+DATASETS = ["mushrooms", "mushroom_cleaned", "cleanedDataframe"]
+METHODS = ["csv", "frame", "columns"]
+
+
+def resident_bytes():
+    # Current RSS from /proc (Linux); falls back to peak RSS elsewhere
+    try:
+        with open("/proc/self/statm") as statm:
+            import os
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(method, name):
+    import numpy as np
+    import pandas as pd
+
+    from Services import DatasetStore
+
+    before = resident_bytes()
+    start = time.perf_counter()
+    if method == "csv":
+        frame = pd.read_csv(Path("datasets") / f"{name}.csv")
+        checksum = float(frame.select_dtypes("number").to_numpy().sum())
+    elif method == "frame":
+        frame = DatasetStore.load_frame(name)
+        checksum = float(sum(np.asarray(frame[col].cat.codes if frame[col].dtype == "category" else frame[col]).sum()
+                             for col in frame.columns))
+    else:
+        columns = DatasetStore.load_columns(name)
+        checksum = float(sum(column.sum() for column in columns.values()))
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "rss": resident_bytes() - before, "checksum": checksum}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV parsing against the memory-mapped columnar store")
+    parser.add_argument("--child", nargs=2, metavar=("METHOD", "DATASET"), help=argparse.SUPPRESS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return
+
+    print(f"{'dataset':<18}{'method':<9}{'load ms':>10}{'RSS delta':>14}")
+    for name in DATASETS:
+        for method in METHODS:
+            runs = [json.loads(subprocess.check_output([sys.executable, "-m", "Benchmarks.DatasetStoreBenchmark",
+                                                        "--child", method, name]))
+                    for _ in range(args.repeat)]
+            best = min(runs, key=lambda run: run["seconds"])
+            print(f"{name:<18}{method:<9}{best['seconds'] * 1000:>10.1f}{best['rss'] / 1024:>12,.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Compare the pickled random forest with its flat NumPy export: cold-start load time and resident
+# memory (each measured in a fresh interpreter), then predict latency per batch size.
+# Run from the project root after exporting:  python -m Services.FlatForest
+#                                             python -m Benchmarks.FlatForestBenchmark
+import argparse
+import json
+import subprocess
+import sys
+import time
+import warnings
+
+from Benchmarks.DatasetStoreBenchmark import resident_bytes
+
+BATCH_SIZES = [1, 16, 64, 256, 1024, 8124]
+
+
+def cold_load(kind):
+    # Import costs are paid up front so only the artifact load itself is timed
+    import joblib  # noqa: F401
+    import sklearn.ensemble  # noqa: F401
+
+    from Services import ModelRegistry
+    from Services.FlatForest import FlatForest  # noqa: F401
+
+    warnings.simplefilter("ignore")
+    before = resident_bytes()
+    start = time.perf_counter()
+    model = ModelRegistry.get("random_forest" if kind == "pickle" else "random_forest_flat")
+    seconds = time.perf_counter() - start
+    model.predict_proba([[0.0] * 10])  # touch the arrays a first prediction needs
+    return {"seconds": seconds, "rss": resident_bytes() - before}
+
+
+def best_of(func, x, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(x)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pickled forest against the flat NumPy export")
+    parser.add_argument("--child", choices=("pickle", "flat"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(cold_load(args.child)))
+        return
+
+    print(f"{'artifact':<10}{'load ms':>10}{'RSS delta':>14}")
+    for kind in ("pickle", "flat"):
+        runs = [json.loads(subprocess.check_output([sys.executable, "-m", "Benchmarks.FlatForestBenchmark",
+                                                    "--child", kind])) for _ in range(3)]
+        best = min(runs, key=lambda run: run["seconds"])
+        print(f"{kind:<10}{best['seconds'] * 1000:>10.1f}{best['rss'] / 1024:>12,.0f}KB")
+
+    import numpy as np
+
+    from Services import ModelRegistry
+    from Services.FlatForest import bundled_check_data
+
+    warnings.simplefilter("ignore")
+    forest, flat = ModelRegistry.get("random_forest"), ModelRegistry.get("random_forest_flat")
+    x = bundled_check_data()[0]
+    if not np.array_equal(forest.predict(x), flat.predict(x)):
+        raise AssertionError("flat export disagrees with the pickled forest")
+    print(f"\n{'batch':>8}{'sklearn ms':>12}{'flat ms':>10}")
+    for size in BATCH_SIZES:
+        batch = x[:size]
+        print(f"{size:>8,}{best_of(forest.predict, batch) * 1000:>12.2f}{best_of(flat.predict, batch) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Headless import-time report for the app and its page modules.
+# Each target is imported in a fresh interpreter under `python -X importtime`; the report gives the
+# target's cumulative import cost and the packages that contribute most (self time summed per
+# top-level package, so nested imports are not double counted). --startup also times a cold run of
+# Main.py in bare mode up to the rendered login page.
+# Run from the project root:  python -m Benchmarks.ImportProfile [--top 8] [--startup]
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+TARGETS = ["Main", "Views.Home", "Views.EdibilityChecker", "Views.MushroomMlLab", "Views.MushroomWisdom",
+           "Views.Gallery"]
+
+
+def import_times(module):
+    # [(self us, cumulative us, module name, depth)] in the order -X importtime reports them
+    env = {**os.environ, "PYTHONWARNINGS": "ignore"}
+    code = f"import runpy; runpy.run_path('Main.py')" if module == "Main" else f"import {module}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), name.strip(), depth))
+    return rows
+
+
+def report(module, top):
+    rows = import_times(module)
+    total_ms = sum(self_us for self_us, _, _, _ in rows) / 1000
+    by_package = defaultdict(int)
+    for self_us, _, name, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    print(f"{module}: {total_ms:,.0f}ms across {len(rows)} modules")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<28}{self_us / 1000:>9.1f}ms")
+
+
+def startup(repeat):
+    # Wall clock from interpreter launch to Main.py having rendered the login page (bare mode)
+    env = {**os.environ, "PYTHONWARNINGS": "ignore"}
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import runpy; runpy.run_path('Main.py')"],
+                       capture_output=True, env=env, check=True)
+        best = min(best, time.perf_counter() - start)
+    print(f"cold start to login page: {best * 1000:,.0f}ms (best of {repeat})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report per-package import cost of the app's modules")
+    parser.add_argument("targets", nargs="*", default=TARGETS)
+    parser.add_argument("--top", type=int, default=8, help="Packages listed per target")
+    parser.add_argument("--startup", action="store_true", help="Also time a cold Main.py run")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for module in args.targets:
+        report(module, args.top)
+    if args.startup:
+        startup(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Load generator for Services/InferenceServer.py.
+# Starts the service in-process once per batch window, hammers /predict/<model> from concurrent
+# keep-alive clients and reports p50/p99 latency and throughput, then times the bulk endpoint.
+# Run from the project root:  python -m Benchmarks.InferenceServerBenchmark --clients 16 --requests 200
+import argparse
+import http.client
+import json
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from Services import ModelRegistry
+from Services.InferenceServer import create_app
+
+
+class QuietHandler(WSGIRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_request(self, *args):
+        pass
+
+
+def start_server(batch_size, wait_ms):
+    server = make_server("127.0.0.1", 0, create_app(batch_size, wait_ms), threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def client(port, path, bodies, latencies):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Content-Type": "application/json"}
+    for body in bodies:
+        start = time.perf_counter()
+        connection.request("POST", path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"{path} returned {response.status}")
+    connection.close()
+
+
+def run_window(specimens, model, batch_size, wait_ms, clients, requests_per_client):
+    server = start_server(batch_size, wait_ms)
+    port = server.server_port
+    path = f"/predict/{model}"
+    bodies = [json.dumps(row) for row in specimens[: clients * requests_per_client]]
+    latencies = [[] for _ in range(clients)]
+
+    client(port, path, bodies[:5], [])  # warm up model and connection
+    threads = [threading.Thread(target=client, args=(port, path, bodies[i::clients], latencies[i]))
+               for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    samples = np.concatenate([np.asarray(lat) for lat in latencies]) * 1000
+    return np.percentile(samples, 50), np.percentile(samples, 99), len(samples) / elapsed
+
+
+def run_bulk(specimens, model):
+    server = start_server(64, 0)
+    body = "".join(json.dumps(row) + "\n" for row in specimens)
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port)
+    start = time.perf_counter()
+    connection.request("POST", f"/predict/{model}/bulk", body=body, headers={"Content-Type": "application/x-ndjson"})
+    lines = connection.getresponse().read().count(b"\n")
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    return lines, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the micro-batching inference service")
+    parser.add_argument("--model", default="logistic_regression")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per client")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--windows", default="0,1,2,5,10", help="Comma-separated batch windows in ms")
+    parser.add_argument("--dataset", default="datasets/mushrooms.csv")
+    args = parser.parse_args()
+
+    raw = pd.read_csv(args.dataset).drop(columns=["class"])
+    needed = args.clients * args.requests
+    specimens = pd.concat([raw] * (needed // len(raw) + 1)).head(max(needed, len(raw))).to_dict("records")
+    ModelRegistry.preload([args.model, "feature_pipeline"])
+
+    print(f"{args.clients} clients x {args.requests} requests, model={args.model}, batch size {args.batch_size}")
+    print(f"{'window':>8}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for wait_ms in (float(w) for w in args.windows.split(",")):
+        p50, p99, throughput = run_window(specimens, args.model, args.batch_size, wait_ms, args.clients, args.requests)
+        print(f"{wait_ms:>6.1f}ms{p50:>10.2f}{p99:>10.2f}{throughput:>10.0f}")
+
+    lines, elapsed = run_bulk(specimens, args.model)
+    print(f"bulk: {lines:,} specimens in {elapsed:.2f}s ({lines / elapsed:,.0f} specimens/s)")
+
+
+if __name__ == "__main__":
+    main()
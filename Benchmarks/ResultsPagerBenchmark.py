@@ -0,0 +1,59 @@
+# Compare what st.dataframe has to serialize for the full results frame against one ResultsPager page.
+# Payload is the Arrow IPC size Streamlit sends over the websocket; time covers building the frame
+# (copy + label column, or sort/filter + page) and serializing it.
+# Run from the project root:  python -m Benchmarks.ResultsPagerBenchmark --scales 1 10 100
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from Services.ResultsPager import ResultsPager
+
+
+def arrow_bytes(frame):
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(frame)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def full_frame(data, predictions):
+    results = data.copy()
+    results["Prediction"] = ["Edible" if pred == 0 else "Poisonous" for pred in predictions]
+    return arrow_bytes(results)
+
+
+def one_page(data, predictions, page_size):
+    pager = ResultsPager(data, predictions)
+    rows = pager.query(prediction=1, sort_by=data.columns[1], ascending=False)
+    return arrow_bytes(pager.page(rows, 0, page_size))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-table rendering against paged results")
+    parser.add_argument("--dataset", default="datasets/mushrooms.csv")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.dataset)
+    print(f"{'rows':>10}{'full ms':>10}{'full bytes':>14}{'page ms':>10}{'page bytes':>12}")
+    for scale in args.scales:
+        data = pd.concat([base] * scale, ignore_index=True)
+        predictions = np.random.default_rng(0).integers(0, 2, len(data))
+        full_size, full_seconds = timed(full_frame, data, predictions)
+        page_size, page_seconds = timed(one_page, data, predictions, args.page_size)
+        print(f"{len(data):>10,}{full_seconds * 1000:>10.1f}{full_size:>14,}{page_seconds * 1000:>10.1f}{page_size:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Compare the per-row classify_mushroom loop with the vectorized classify_batch.
+# Run from the project root:  python -m Benchmarks.RuleEngineBenchmark --rows 500000
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from Services.RuleEngine import CODES, FEATURES, classify_batch, classify_mushroom
+
+
+def random_specimens(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({name: rng.choice(np.array(CODES[name], dtype=object), size=rows) for name in FEATURES})
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def per_row(frame):
+    return np.array([classify_mushroom(*row) for row in frame[list(FEATURES)].itertuples(index=False)], dtype=object)
+
+
+def run(name, frame):
+    expected, loop_seconds = timed(per_row, frame)
+    actual, batch_seconds = timed(classify_batch, frame)
+    if not np.array_equal(expected, actual):
+        raise AssertionError(f"{name}: classify_batch disagrees with classify_mushroom")
+
+    rows = len(frame)
+    print(f"{name}: {rows:,} rows")
+    print(f"  classify_mushroom loop : {loop_seconds:8.3f}s  ({rows / loop_seconds:,.0f} rows/s)")
+    print(f"  classify_batch         : {batch_seconds:8.3f}s  ({rows / batch_seconds:,.0f} rows/s)")
+    print(f"  speed-up               : {loop_seconds / batch_seconds:8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized rule engine")
+    parser.add_argument("--rows", type=int, default=200_000, help="Number of random specimens to score")
+    parser.add_argument("--dataset", default="datasets/mushrooms.csv", help="Bundled dataset to score as well")
+    args = parser.parse_args()
+
+    run("random specimens", random_specimens(args.rows))
+    run(args.dataset, pd.read_csv(args.dataset))
+
+
+if __name__ == "__main__":
+    main()
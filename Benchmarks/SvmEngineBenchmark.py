@@ -0,0 +1,55 @@
+# Compare the exact SVC(probability=True) with ApproximateSVC on the bundled datasets.
+# Both see the same 70/30 split the ML Lab uses; fit time, test AUC and accuracy are reported.
+# Run from the project root:  python -m Benchmarks.SvmEngineBenchmark
+# (the exact SVC takes minutes on mushroom_cleaned.csv; --max-rows caps the rows used)
+import argparse
+import time
+
+import pandas as pd
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.svm import SVC
+
+from Services.CategoricalCodec import CategoricalCodec
+from Services.ChunkedIngest import infer_target
+from Services.FastSvm import ApproximateSVC
+
+DATASETS = ["datasets/mushrooms.csv", "datasets/mushroom_cleaned.csv"]
+
+
+def load(path, max_rows=None):
+    frame = pd.read_csv(path, nrows=max_rows)
+    target, _ = infer_target(frame.columns)
+    encoded = CategoricalCodec().fit_transform(frame)
+    return train_test_split(encoded.drop(columns=[target]), encoded[target], test_size=0.3, random_state=0)
+
+
+def run(name, model, x_train, x_test, y_train, y_test):
+    start = time.perf_counter()
+    model.fit(x_train, y_train)
+    seconds = time.perf_counter() - start
+    auc = roc_auc_score(y_test, model.predict_proba(x_test)[:, 1])
+    accuracy = accuracy_score(y_test, model.predict(x_test))
+    print(f"  {name:<34}{seconds:>9.2f}s{auc:>9.4f}{accuracy:>9.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exact SVC against the approximate SVM engine")
+    parser.add_argument("--max-rows", type=int, default=None)
+    parser.add_argument("--kernel", default="rbf", choices=("rbf", "linear"))
+    parser.add_argument("--C", type=float, default=1.0)
+    parser.add_argument("--skip-exact", action="store_true")
+    args = parser.parse_args()
+
+    for path in DATASETS:
+        x_train, x_test, y_train, y_test = load(path, args.max_rows)
+        print(f"{path}: {len(x_train):,} train / {len(x_test):,} test rows")
+        print(f"  {'engine':<34}{'fit':>10}{'AUC':>9}{'acc':>9}")
+        if not args.skip_exact:
+            run("SVC(probability=True)", SVC(C=args.C, kernel=args.kernel, probability=True),
+                x_train, x_test, y_train, y_test)
+        run("ApproximateSVC", ApproximateSVC(C=args.C, kernel=args.kernel), x_train, x_test, y_train, y_test)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# Simulate many Streamlit sessions logging in and signing up at once, against the old
+# connect-per-call rollback-journal code and against the pooled WAL UserStore.
+# Password hashing uses a cheap iteration count by default so the database is what gets measured
+# (pass --hash-method pbkdf2:sha256 for the production cost).
+# Run from the project root:  python -m Benchmarks.UserStoreBenchmark --sessions 32 --ops 200
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from Services.PasswordHasher import HasherBusy
+from Services.UserStore import CREATE_USERS, INSERT_USER, SELECT_PASSWORD, UserStore
+
+
+class ConnectPerCall:
+    # The original Main.py functions, parameterised on path and hash method
+    def __init__(self, path, hash_method):
+        self.path = str(path)
+        self.hash_method = hash_method
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(CREATE_USERS)
+
+    def add_user(self, username, password):
+        hashed_password = generate_password_hash(password, method=self.hash_method)
+        try:
+            with sqlite3.connect(self.path) as conn:
+                conn.execute(INSERT_USER, (username, hashed_password))
+                conn.commit()
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def authenticate(self, username, password):
+        with sqlite3.connect(self.path) as conn:
+            result = conn.execute(SELECT_PASSWORD, (username,)).fetchone()
+            if result:
+                return check_password_hash(result[0], password)
+        return False
+
+
+def session(store, session_id, ops, signup_share, latencies, errors, seed):
+    rng = np.random.default_rng(seed)
+    for op in range(ops):
+        start = time.perf_counter()
+        try:
+            if op == 0 or rng.random() < signup_share:
+                store.add_user(f"user-{session_id}-{op}", "secret")
+            else:
+                store.authenticate(f"user-{session_id}-{rng.integers(op)}", "secret")
+        except (sqlite3.OperationalError, HasherBusy) as exc:  # locked past the busy timeout, or hash pool full
+            errors.append(str(exc))
+        latencies.append(time.perf_counter() - start)
+
+
+def run(name, store, sessions, ops, signup_share):
+    latencies, errors = [], []
+    threads = [threading.Thread(target=session, args=(store, i, ops, signup_share, latencies, errors, i))
+               for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    print(f"{name:<18}{len(latencies) / seconds:>10,.0f}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}{len(errors):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent logins and signups against the user store")
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--ops", type=int, default=200, help="Operations per session")
+    parser.add_argument("--signup-share", type=float, default=0.2)
+    parser.add_argument("--hash-method", default="pbkdf2:sha256:1000")
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions x {args.ops} ops, {args.signup_share:.0%} signups")
+    print(f"{'store':<18}{'ops/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'refused':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        run("connect per call", ConnectPerCall(Path(tmp) / "baseline.db", args.hash_method),
+            args.sessions, args.ops, args.signup_share)
+        store = UserStore(Path(tmp) / "pooled.db", hash_method=args.hash_method)
+        run("pooled WAL", store, args.sessions, args.ops, args.signup_share)
+        stats = store.stats()
+        print(f"pool: {stats['connections']} connections, {stats['pool_waits']} waits "
+              f"({stats['pool_wait_seconds'] * 1000:.1f}ms total)")
+        hashing = store.hasher.stats()
+        print(f"hasher: {hashing['workers']} workers, {hashing['completed']:,} hashes, "
+              f"p95 {hashing.get('hash_ms_p95', 0):.2f}ms hashing + {hashing.get('wait_ms_p95', 0):.2f}ms queued, "
+              f"peak in flight {hashing['max_in_flight']}, {hashing['rejected']} rejected")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,72 +1,56 @@
 import streamlit as st
-import sqlite3
-from werkzeug.security import generate_password_hash, check_password_hash
 from streamlit_option_menu import option_menu
+from Services.PasswordHasher import HasherBusy
+from Services.RateLimit import RateLimited, check_login, check_signup
+from Services.SessionTokens import get_signer
+from Services.StaticAssets import set_background
+from Services.Telemetry import admins, count, get_telemetry, render_prometheus, span, start_metrics_server
+from Services.UserStore import get_store
 
 
 # ----------------------------- Background Styling -----------------------------
 def set_bg_hack_url():
-    st.markdown(
-        """
-        <style>
-            .stApp {
-                background: url("https://avi-chavan-96.sirv.com/Mushroom/parasol-4549617_1280.jpg");
-                background-size: cover;
-                background-position: center;
-                min-height: 100vh;
-
-            .stButton > button {
-                background-color: #4CAF50;
-                color: white;
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-size: 16px;
-            }
-            .stButton > button:hover {
-                background-color: #45a049;
-            }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
-
-set_bg_hack_url()
+    # Login page only: each page sets its own background, and emitting both made the browser fetch two
+    set_background("login", "cover")
+
+st.markdown(
+    """
+    <style>
+        .stButton > button {
+            background-color: #4CAF50;
+            color: white;
+            border-radius: 8px;
+            padding: 8px 16px;
+            font-size: 16px;
+        }
+        .stButton > button:hover {
+            background-color: #45a049;
+        }
+    </style>
+    """,
+    unsafe_allow_html=True
+)
 
 # ----------------------------- Database Initialization -----------------------------
 def init_db():
-    with sqlite3.connect("users.db") as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL
-            )
-        """)
-        conn.commit()
+    # Creates the users table on first use; connections are pooled per process
+    return get_store()
 
 # ----------------------------- User Authentication -----------------------------
+# Rate limits are checked before any password hash is computed; both raise RateLimited
 def add_user(username, password):
-    hashed_password = generate_password_hash(password, method="pbkdf2:sha256")
-    try:
-        with sqlite3.connect("users.db") as conn:
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, hashed_password))
-            conn.commit()
-        return True
-    except sqlite3.IntegrityError:
-        return False
+    check_signup(st.context.ip_address)
+    with span("add_user"):
+        return get_store().add_user(username, password)
 
 def authenticate_user(username, password):
-    with sqlite3.connect("users.db") as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT password FROM users WHERE username = ?", (username,))
-        result = cursor.fetchone()
-        if result:
-            return check_password_hash(result[0], password)
-    return False
+    check_login(username, st.context.ip_address)
+    with span("authenticate_user"):
+        return get_store().authenticate(username, password)
 
 init_db()
+count("reruns")
+start_metrics_server()
 
 # ----------------------------- Session State Initialization -----------------------------
 if "authenticated" not in st.session_state:
@@ -84,11 +68,22 @@ def login():
 
     if submit:
         if username and password:
-            if authenticate_user(username, password):
+            try:
+                authenticated = authenticate_user(username, password)
+            except RateLimited as exc:
+                count("logins", outcome="rate_limited")
+                st.error(f"⏳ {exc}")
+                return
+            except HasherBusy:
+                count("logins", outcome="busy")
+                st.error("⏳ The server is busy, please try again in a moment.")
+                return
+            count("logins", outcome="success" if authenticated else "failure")
+            if authenticated:
                 st.session_state.authenticated = True
                 st.session_state.current_user = username
-                st.query_params["authenticated"] = True
-                st.query_params["username"] = username
+                # Signed token in the URL: later reruns (on any replica) validate it without the DB
+                st.query_params["session"] = get_signer().issue(username)
                 st.success(f"✅ Welcome back, **{username}**!")
             else:
                 st.error("❌ Invalid username or password!")
@@ -105,13 +100,39 @@ def signup():
 
     if submit:
         if new_username and new_password:
-            if add_user(new_username, new_password):
+            try:
+                created = add_user(new_username, new_password)
+            except RateLimited as exc:
+                count("signups", outcome="rate_limited")
+                st.error(f"⏳ {exc}")
+                return
+            except HasherBusy:
+                count("signups", outcome="busy")
+                st.error("⏳ The server is busy, please try again in a moment.")
+                return
+            count("signups", outcome="success" if created else "taken")
+            if created:
                 st.success("✅ Account created successfully! Please log in.")
             else:
                 st.error("❌ Username already exists!")
         else:
             st.warning("⚠️ Please fill out all fields!")
 
+# ----------------------------- Metrics Panel -----------------------------
+def metrics_panel():
+    # Admins only (MUSHROOM_ADMINS); the same numbers are on /metrics when MUSHROOM_METRICS_PORT is set
+    telemetry = get_telemetry()
+    with st.sidebar.expander("📈 Metrics"):
+        st.caption("Stage latency (ms) in this process")
+        st.dataframe([{"stage": row["stage"], "labels": row["labels"], "count": row["count"],
+                       **{q: round(row[q] * 1000, 1) for q in ("p50", "p95", "p99")},
+                       "total s": round(row["total_seconds"], 2)} for row in telemetry.stages()],
+                     hide_index=True)
+        st.caption("Counters")
+        for (name, labels), value in telemetry.counter_values().items():
+            st.write(f"{name} {' '.join(f'{k}={v}' for k, v in labels)}: **{value:,}**")
+        st.download_button("Prometheus text", render_prometheus(), file_name="metrics.prom", mime="text/plain")
+
 # ----------------------------- Main Application -----------------------------
 def Main_app():
     st.title(f"👋 Welcome, {st.session_state.current_user}!")
@@ -138,22 +159,26 @@ def Main_app():
             }
         )
 
-    # Load pages dynamically
-    if selected == "Home":
-        from views.Home import app
-        app()
-    elif selected == "Edibility Checker":
-        from views.EdibilityChecker import app
-        app()
-    elif selected == "Mushroom ML Lab":
-        from views.MushroomMlLab import app
-        app()
-    elif selected == "Mushroom Wisdom":
-        from views.MushroomWisdom import app
-        app()
-    elif selected == "Gallery":
-        from views.Gallery import app
-        app()
+    # Load pages dynamically; each page's whole render is one span
+    with span("render", page=selected):
+        if selected == "Home":
+            from Views.Home import app
+            app()
+        elif selected == "Edibility Checker":
+            from Views.EdibilityChecker import app
+            app()
+        elif selected == "Mushroom ML Lab":
+            from Views.MushroomMlLab import app
+            app()
+        elif selected == "Mushroom Wisdom":
+            from Views.MushroomWisdom import app
+            app()
+        elif selected == "Gallery":
+            from Views.Gallery import app
+            app()
+
+    if st.session_state.current_user in admins():
+        metrics_panel()
 
     # Logout Button
     if st.sidebar.button("🚪 Logout"):
@@ -164,19 +189,20 @@ def Main_app():
 
 # ----------------------------- Main Logic -----------------------------
 try:
-    authenticated = st.query_params.get("authenticated", False)
-    username = st.query_params.get("username", None)
-    
-    if authenticated and username:
+    username = get_signer().verify(st.query_params.get("session"))
+
+    if username:
         st.session_state.authenticated = True
         st.session_state.current_user = username
         Main_app()
     else:
         raise ValueError("Invalid state")
 except Exception:
+    set_bg_hack_url()
     st.sidebar.title("🍄 Mushroom Classifier")
     page = st.sidebar.radio("🔐 Authentication", ["🔒 Login", "📝 Sign Up"])
-    if page == "🔒 Login":
-        login()
-    elif page == "📝 Sign Up":
-        signup()
+    with span("render", page="login" if page == "🔒 Login" else "signup"):
+        if page == "🔒 Login":
+            login()
+        elif page == "📝 Sign Up":
+            signup()
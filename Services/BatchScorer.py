@@ -0,0 +1,256 @@
+# Headless batch scoring for large mushroom CSVs.
+# Streams the input in chunks, encodes each chunk with the saved feature pipeline, scores it with a
+# pickled model from Models/ and appends the predictions to CSV or Parquet, so memory stays bounded
+# by --chunksize no matter how big the input is.
+#
+#   python -m Services.BatchScorer datasets/mushrooms.csv predictions.csv --model random_forest
+#   python -m Services.BatchScorer survey.csv predictions.parquet --workers 4 --chunksize 100000
+import argparse
+import io
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from Services import ModelRegistry
+from Services.FeaturePipeline import CODED_COLUMNS, PCA_COLUMNS, normalize_columns
+
+TARGET_COLUMNS = ["class", "type", "class=e", "class=p"]
+SCORING_MODELS = ["logistic_regression", "random_forest", "svm", "random_forest_flat"]
+
+
+# ----------------------------- Model & Encoding -----------------------------
+def load_model(model):
+    if model in ModelRegistry.ARTIFACTS:
+        return ModelRegistry.get(model)
+    import joblib
+    return joblib.load(model, mmap_mode="r")
+
+
+def encode_chunk(chunk, model):
+    normalized = normalize_columns(chunk)
+    if set(CODED_COLUMNS + PCA_COLUMNS).issubset(normalized.columns):
+        # Raw letter codes shaped like datasets/mushrooms.csv
+        return ModelRegistry.get("feature_pipeline").transform(normalized).to_numpy()
+
+    # Already-encoded numeric data: pass the feature columns straight through to a model trained on them
+    features = chunk.drop(columns=[col for col in TARGET_COLUMNS if col in chunk.columns])
+    expected = getattr(model, "n_features_in_", features.shape[1])
+    if features.shape[1] != expected:
+        raise ValueError(f"Input has {features.shape[1]} feature columns ({', '.join(map(str, features.columns))}) "
+                         f"but the model expects {expected}. The bundled models were trained on the letter-coded "
+                         f"columns of datasets/mushrooms.csv; for other encodings (e.g. mushroom_cleaned.csv) "
+                         f"pass --model with a joblib pickle trained on those columns")
+    return features.to_numpy(dtype=np.float64)
+
+
+def check_input(input_path, model_name):
+    # Encode a few rows up front so a schema mismatch fails before any output or worker is created
+    model = load_model(model_name)
+    try:
+        encode_chunk(pd.read_csv(input_path, nrows=5), model)
+    except (KeyError, ValueError) as exc:
+        raise SystemExit(f"{input_path}: {exc}") from exc
+
+
+def score_chunk(chunk, model):
+    features = encode_chunk(chunk, model)
+    # Output rows line up one-to-one, in order, with the input rows. Models with predict_proba make a
+    # single pass: the label is the most probable class.
+    if hasattr(model, "predict_proba"):
+        proba = model.predict_proba(features)
+        predictions = np.asarray(model.classes_)[np.argmax(proba, axis=1)]
+        poisonous = proba[:, list(model.classes_).index(1)] if 1 in model.classes_ else proba[:, -1]
+    else:
+        predictions, poisonous = model.predict(features), None
+    scored = pd.DataFrame({"prediction": np.where(predictions == 1, "Poisonous", "Edible")})
+    if poisonous is not None:
+        scored["probability_poisonous"] = poisonous.astype(np.float32)
+    return scored
+
+
+# ----------------------------- Writers -----------------------------
+class CsvWriter:
+    def __init__(self, path):
+        self.path = path
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.path, mode="w" if self.header else "a", header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        if self.header:
+            pd.DataFrame(columns=["prediction"]).to_csv(self.path, index=False)
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as exc:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow") from exc
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        table = self.pa.Table.from_pandas(frame, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is None:
+            self.pq.write_table(self.pa.table({"prediction": self.pa.array([], self.pa.string())}), self.path)
+        else:
+            self.writer.close()
+
+
+def open_writer(path):
+    return ParquetWriter(path) if Path(path).suffix == ".parquet" else CsvWriter(path)
+
+
+# ----------------------------- Sharding -----------------------------
+class ByteRange(io.RawIOBase):
+    # Read-only view of [start, end) in a file, so pandas can parse one shard without touching the rest
+    def __init__(self, path, start, end):
+        self.file = open(path, "rb")
+        self.file.seek(start)
+        self.remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self.remaining)
+        read = self.file.readinto(memoryview(buffer)[:size])
+        self.remaining -= read
+        return read
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+def shard_ranges(input_path, num_shards):
+    # Split the data rows into contiguous byte ranges that start and end on line boundaries.
+    # Assumes no quoted newlines, which holds for the single-letter/numeric mushroom datasets.
+    size = os.path.getsize(input_path)
+    with open(input_path, "rb") as source:
+        header = source.readline()
+        bounds = [len(header)]
+        for shard in range(1, num_shards):
+            source.seek(max(bounds[-1], len(header) + (size - len(header)) * shard // num_shards))
+            source.readline()
+            bounds.append(min(source.tell(), size))
+    bounds.append(size)
+    columns = header.decode().strip().split(",")
+    # More shards than lines leaves some empty; those are dropped rather than scored as zero rows
+    return columns, [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+
+# ----------------------------- Scoring Loop -----------------------------
+def score_shard(input_path, output_path, model_name, chunksize, columns=None, byte_range=None, shard=0):
+    model = load_model(model_name)
+    writer = open_writer(output_path)
+    rows = 0
+    start = time.perf_counter()
+    if byte_range is None:
+        source = open(input_path, "rb")
+        read_args = {}
+    else:
+        source = io.BufferedReader(ByteRange(input_path, *byte_range))
+        read_args = {"header": None, "names": columns}
+    try:
+        for chunk in pd.read_csv(source, chunksize=chunksize, **read_args):
+            writer.write(score_chunk(chunk, model))
+            rows += len(chunk)
+            elapsed = time.perf_counter() - start
+            print(f"[shard {shard}] {rows:,} rows  {rows / elapsed:,.0f} rows/s", file=sys.stderr)
+    finally:
+        source.close()
+        writer.close()
+    return rows, time.perf_counter() - start
+
+
+def part_path(output_path, shard):
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.part-{shard:03d}{output_path.suffix}")
+
+
+def merge_csv_parts(parts, output_path):
+    with open(output_path, "wb") as merged:
+        for i, part in enumerate(parts):
+            with open(part, "rb") as source:
+                if i:
+                    source.readline()  # header already written by the first part
+                shutil.copyfileobj(source, merged)
+            Path(part).unlink()
+
+
+def merge_parquet_parts(parts, output_path):
+    # Row group by row group, so memory stays bounded by one part's row group, not the whole output
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for part in parts:
+            source = pq.ParquetFile(part)
+            for group in range(source.num_row_groups):
+                table = source.read_row_group(group)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+            if writer is None:  # empty part: keep its schema for an empty output
+                writer = pq.ParquetWriter(output_path, source.schema_arrow)
+            source.close()
+    finally:
+        if writer is not None:
+            writer.close()
+    for part in parts:
+        Path(part).unlink()
+
+
+def run(input_path, output_path, model_name="logistic_regression", chunksize=50_000, workers=1):
+    start = time.perf_counter()
+    check_input(input_path, model_name)
+    if workers <= 1:
+        rows, _ = score_shard(input_path, output_path, model_name, chunksize)
+    else:
+        # Shards are contiguous, so concatenating the parts in shard order keeps the input row order
+        columns, ranges = shard_ranges(input_path, workers)
+        parts = [part_path(output_path, shard) for shard in range(len(ranges))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(score_shard, input_path, part, model_name, chunksize, columns, byte_range, shard)
+                       for shard, (part, byte_range) in enumerate(zip(parts, ranges))]
+            rows = sum(future.result()[0] for future in futures)
+        if Path(output_path).suffix == ".parquet":
+            merge_parquet_parts(parts, output_path)
+        else:
+            merge_csv_parts(parts, output_path)
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a mushroom CSV with a pickled model, chunk by chunk")
+    parser.add_argument("input", help="CSV shaped like datasets/mushrooms.csv or an already-encoded dataset")
+    parser.add_argument("output", help="Destination .csv or .parquet")
+    parser.add_argument("--model", default="logistic_regression",
+                        help=f"One of {', '.join(SCORING_MODELS)} or a path to a joblib pickle")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="Rows read, encoded and scored at a time")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes; each scores a contiguous shard of the input")
+    args = parser.parse_args(argv)
+
+    rows, seconds = run(args.input, args.output, args.model, args.chunksize, args.workers)
+    print(f"Scored {rows:,} rows in {seconds:.2f}s ({rows / max(seconds, 1e-9):,.0f} rows/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Vectorized replacement for fitting one LabelEncoder per column.
+# Each column is factorized once with sorted vocabularies, which yields exactly the codes
+# LabelEncoder would, stored in the narrowest signed integer type that fits (int8 for the
+# mushroom datasets). The vocabularies are kept so codes can be mapped back to values.
+import numpy as np
+import pandas as pd
+
+
+def code_dtype(size):
+    for dtype in (np.int8, np.int16, np.int32):
+        if size <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class CategoricalCodec:
+    def __init__(self, vocabularies=None):
+        # Vocabularies collected elsewhere (e.g. over a whole streamed file) can be passed in and
+        # used with transform directly; they must be sorted, as fit_transform leaves them
+        self.vocabularies = dict(vocabularies or {})
+
+    def fit_transform(self, frame):
+        # Returns a new frame; the input is left untouched
+        encoded = {}
+        for col in frame.columns:
+            codes, uniques = pd.factorize(frame[col], sort=True)
+            self.vocabularies[col] = uniques
+            encoded[col] = codes.astype(code_dtype(len(uniques)), copy=False)
+        return pd.DataFrame(encoded, index=frame.index)
+
+    def fit(self, frame):
+        self.fit_transform(frame)
+        return self
+
+    def transform(self, frame):
+        # Unseen categories become -1. Unseen numbers take the rank of the nearest lower known
+        # value, so ordinal columns keep their ordering when later data extends the range.
+        encoded = {}
+        for col in frame.columns:
+            vocabulary = self.vocabularies[col]
+            if pd.api.types.is_numeric_dtype(vocabulary) and pd.api.types.is_numeric_dtype(frame[col]):
+                codes = np.searchsorted(vocabulary, frame[col].to_numpy(), side="right") - 1
+                codes = codes.clip(0, max(len(vocabulary) - 1, 0))
+            else:
+                codes = pd.Categorical(frame[col], categories=vocabulary).codes
+            encoded[col] = codes.astype(code_dtype(len(vocabulary)), copy=False)
+        return pd.DataFrame(encoded, index=frame.index)
+
+    def inverse_transform(self, frame):
+        decoded = {}
+        for col in frame.columns:
+            decoded[col] = pd.Categorical.from_codes(frame[col].to_numpy(), categories=self.vocabularies[col])
+        return pd.DataFrame(decoded, index=frame.index)
+
+    def labels(self, col, codes):
+        return self.vocabularies[col].take(np.asarray(codes))
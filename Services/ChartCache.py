@@ -0,0 +1,186 @@
+# Rendered ML Lab metric charts.
+# A chart depends only on the trained model, the test split it is evaluated on, and the class names.
+# The page keys each EvaluationBundle on the ModelCache key plus the split, so re-clicking Classify on
+# a cached model gets its bundle back without running inference, and each chart is drawn and
+# rasterised once per (key, metric, class names); later requests get the PNG bytes back from a
+# byte-bounded LRU. Bundles without a key fall back to a digest of the model's test-set outputs.
+# Curves are thinned to at most MAX_POINTS points before drawing. Figures are built with
+# matplotlib.figure.Figure rather than pyplot, which keeps no global state, and are freed once
+# rasterised.
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from Services.LazyImport import lazy_import
+
+figure = lazy_import("matplotlib.figure")
+sns = lazy_import("seaborn")
+
+METRICS = ("Confusion Matrix", "ROC Curve", "Precision-Recall Curve", "Recall vs Threshold",
+           "F1-Score vs Threshold")
+MAX_POINTS = 400
+DPI = 150
+DEFAULT_BUDGET_MB = 64
+MAX_EVALUATIONS = 16
+
+
+def downsample(x, y, max_points=MAX_POINTS):
+    # Keep max_points vertices spread evenly along the curve's length (axes scaled to [0, 1]), so
+    # steps and corners survive while long straight runs lose their redundant points
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if len(x) <= max_points:
+        return x, y
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if len(x) <= max_points:
+        return x, y
+    span_x = np.ptp(x) or 1.0
+    span_y = np.ptp(y) or 1.0
+    steps = np.hypot(np.diff(x) / span_x, np.diff(y) / span_y)
+    length = np.concatenate(([0.0], np.cumsum(steps)))
+    keep = np.searchsorted(length, np.linspace(0.0, length[-1], max_points))
+    keep = np.unique(np.clip(keep, 0, len(x) - 1))
+    keep[-1] = len(x) - 1
+    return x[keep], y[keep]
+
+
+# ----------------------------- Charts -----------------------------
+def _confusion_matrix(ax, evaluation, class_names):
+    sns.heatmap(evaluation.confusion_matrix, annot=True, fmt='d', cmap='Blues', xticklabels=class_names,
+                yticklabels=class_names, ax=ax)
+    ax.set_ylabel('True label')
+    ax.set_xlabel('Predicted label')
+
+
+def _roc_curve(ax, evaluation, class_names):
+    fpr, tpr, _, roc_auc = evaluation.roc_curve
+    ax.plot(*downsample(fpr, tpr), color='blue', lw=2, label=f'ROC curve (area = {roc_auc:.2f})')
+    ax.plot([0, 1], [0, 1], color='gray', linestyle='--')
+    ax.set_xlim([0.0, 1.0])
+    ax.set_ylim([0.0, 1.05])
+    ax.set_xlabel('False Positive Rate')
+    ax.set_ylabel('True Positive Rate')
+    ax.set_title('Receiver Operating Characteristic (ROC) Curve')
+    ax.legend(loc="lower right")
+
+
+def _precision_recall_curve(ax, evaluation, class_names):
+    precision, recall, _ = evaluation.precision_recall_curve
+    ax.plot(*downsample(recall, precision), color='blue', lw=2)
+    ax.set_xlabel('Recall')
+    ax.set_ylabel('Precision')
+    ax.set_title('Precision-Recall Curve')
+
+
+def _recall_vs_threshold(ax, evaluation, class_names):
+    _, recall, thresholds = evaluation.precision_recall_curve
+    ax.plot(*downsample(thresholds, recall[:-1]), color='green', lw=2)
+    ax.set_xlabel('Threshold')
+    ax.set_ylabel('Recall')
+    ax.set_title('Recall vs Threshold')
+
+
+def _f1_vs_threshold(ax, evaluation, class_names):
+    thresholds, f1_scores = evaluation.f1_curve
+    ax.plot(*downsample(thresholds, f1_scores[:-1]), color='red', lw=2)
+    ax.set_xlabel('Threshold')
+    ax.set_ylabel('F1-Score')
+    ax.set_title('F1-Score vs Threshold')
+
+
+CHARTS = dict(zip(METRICS, (_confusion_matrix, _roc_curve, _precision_recall_curve, _recall_vs_threshold,
+                            _f1_vs_threshold)))
+
+
+def render(metric, evaluation, class_names, dpi=DPI):
+    fig = figure.Figure()
+    CHARTS[metric](fig.subplots(), evaluation, class_names)
+    out = io.BytesIO()
+    fig.savefig(out, format="png", dpi=dpi, bbox_inches="tight")
+    fig.clear()
+    return out.getvalue()
+
+
+class ChartCache:
+    def __init__(self, max_bytes=DEFAULT_BUDGET_MB << 20, dpi=DPI, max_evaluations=MAX_EVALUATIONS):
+        self.max_bytes = max_bytes
+        self.dpi = dpi
+        self.max_evaluations = max_evaluations
+        self.entries = OrderedDict()  # (fingerprint, metric, class names) -> PNG bytes
+        self.evaluations = OrderedDict()  # key -> EvaluationBundle
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evaluation_hits = 0
+        self.evaluation_misses = 0
+        self.render_seconds = 0.0
+
+    def evaluation(self, key, build):
+        # The bundle for `key`; build() runs the model over the test split only on a miss
+        with self.lock:
+            evaluation = self.evaluations.get(key)
+            if evaluation is not None:
+                self.evaluations.move_to_end(key)
+                self.evaluation_hits += 1
+                return evaluation
+            self.evaluation_misses += 1
+        evaluation = build()
+        with self.lock:
+            self.evaluations[key] = evaluation
+            while len(self.evaluations) > self.max_evaluations:
+                self.evaluations.popitem(last=False)
+        return evaluation
+
+    def chart(self, metric, evaluation, class_names):
+        if metric not in CHARTS:
+            raise KeyError(f"Unknown metric '{metric}'. Available: {', '.join(METRICS)}")
+        key = (evaluation.fingerprint, metric, tuple(class_names))
+        with self.lock:
+            png = self.entries.get(key)
+            if png is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return png
+            self.misses += 1
+
+        start = time.perf_counter()
+        png = render(metric, evaluation, class_names, self.dpi)
+        with self.lock:
+            self.render_seconds += time.perf_counter() - start
+            if key not in self.entries and len(png) <= self.max_bytes:
+                self.entries[key] = png
+                self.bytes += len(png)
+                while self.bytes > self.max_bytes:
+                    _, evicted = self.entries.popitem(last=False)
+                    self.bytes -= len(evicted)
+        return png
+
+    def stats(self):
+        with self.lock:
+            return {"charts": len(self.entries), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "render_seconds": self.render_seconds,
+                    "evaluations": len(self.evaluations), "evaluation_hits": self.evaluation_hits,
+                    "evaluation_misses": self.evaluation_misses}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    # MUSHROOM_CHART_CACHE_MB bounds the PNG bytes held in memory
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ChartCache(int(os.environ.get("MUSHROOM_CHART_CACHE_MB", DEFAULT_BUDGET_MB)) << 20)
+    return _cache
+
+
+def get_cache_if_created():
+    # None until something has called get_cache(); never creates one (used by Telemetry's gauges)
+    return _cache
@@ -0,0 +1,110 @@
+# Chunked ingestion for large ML Lab uploads.
+# One pass over the file collects each categorical column's vocabulary and a uniform reservoir sample
+# of rows, which is what the model is trained on; sorted survey files often start with a single class
+# or without some odors, so the head of the file is not a usable sample. Columns with more than
+# MAX_VOCABULARY distinct values (continuous measurements) stop being tracked and take their
+# vocabulary from the sample, so the pass stays within a fixed memory ceiling. Scoring then walks the file
+# chunk by chunk, keeping only running counts and a bounded preview, so memory stays flat however
+# many rows the survey file has.
+import numpy as np
+import pandas as pd
+
+POSSIBLE_TARGETS = ['type', 'class', 'class=e', 'class=p']
+PREVIEW_ROWS = 1000
+MAX_VOCABULARY = 1000
+
+
+def infer_target(columns):
+    # Returns (target column, whether it was guessed as the last column)
+    for col in POSSIBLE_TARGETS:
+        if col in columns:
+            return col, False
+    return columns[-1], True
+
+
+def read_training_sample(source, chunksize, sample_rows, seed=0, max_vocabulary=MAX_VOCABULARY):
+    # Returns (sample, vocabularies). Every row gets a random key and the sample_rows smallest keys
+    # are kept, so memory holds at most the sample plus one chunk. The vocabularies are sorted, in the
+    # form CategoricalCodec stores them: every value in the file for columns with at most
+    # max_vocabulary of them, the sample's values for the rest.
+    rng = np.random.default_rng(seed)
+    sample, keys = None, None
+    seen = {}
+    untracked = set()
+    source.seek(0)
+    with pd.read_csv(source, chunksize=chunksize) as reader:
+        for chunk in reader:
+            for col in chunk.columns:
+                if col in untracked:
+                    continue
+                values = pd.Index(chunk[col].unique())
+                values = values if col not in seen else seen[col].union(values, sort=False)
+                if len(values) > max_vocabulary:
+                    untracked.add(col)
+                    seen.pop(col, None)
+                else:
+                    seen[col] = values
+            chunk_keys = rng.random(len(chunk))
+            if sample is not None:
+                chunk = pd.concat([sample, chunk], ignore_index=True)
+                chunk_keys = np.concatenate([keys, chunk_keys])
+            if len(chunk) > sample_rows:
+                keep = np.sort(np.argpartition(chunk_keys, sample_rows)[:sample_rows])
+                chunk, chunk_keys = chunk.iloc[keep], chunk_keys[keep]
+            sample, keys = chunk.reset_index(drop=True), chunk_keys
+    for col in untracked:
+        seen[col] = pd.Index(sample[col].unique())
+    vocabularies = {col: seen[col].dropna().sort_values() for col in sample.columns}
+    return sample, vocabularies
+
+
+class StreamSummary:
+    def __init__(self, preview_rows=PREVIEW_ROWS):
+        self.preview_rows = preview_rows
+        self.preview_parts = []
+        self.preview_size = 0
+        self.rows = 0
+        self.chunks = 0
+        self.edible = 0
+        self.poisonous = 0
+        self.labelled = 0
+        self.correct = 0
+
+    def add(self, raw_chunk, predictions, truth=None):
+        self.chunks += 1
+        self.rows += len(predictions)
+        poisonous = int(np.count_nonzero(predictions == 1))
+        self.poisonous += poisonous
+        self.edible += len(predictions) - poisonous
+        if truth is not None:
+            known = truth >= 0
+            self.labelled += int(known.sum())
+            self.correct += int((predictions[known] == truth[known]).sum())
+        if self.preview_size < self.preview_rows:
+            part = raw_chunk.head(self.preview_rows - self.preview_size).copy()
+            part['Prediction'] = np.where(predictions[:len(part)] == 0, "Edible", "Poisonous")
+            self.preview_parts.append(part)
+            self.preview_size += len(part)
+
+    @property
+    def accuracy(self):
+        return self.correct / self.labelled if self.labelled else None
+
+    @property
+    def preview(self):
+        return pd.concat(self.preview_parts) if self.preview_parts else pd.DataFrame()
+
+
+def score_chunks(source, chunksize, codec, model, target_column, preview_rows=PREVIEW_ROWS, on_chunk=None):
+    # Re-reads the upload from the start; each chunk is encoded with the codec fitted on the whole-file vocabularies
+    summary = StreamSummary(preview_rows)
+    source.seek(0)
+    with pd.read_csv(source, chunksize=chunksize) as reader:
+        for chunk in reader:
+            encoded = codec.transform(chunk)
+            predictions = np.asarray(model.predict(encoded.drop(columns=[target_column])))
+            truth = encoded[target_column].to_numpy() if target_column in encoded else None
+            summary.add(chunk, predictions, truth)
+            if on_chunk is not None:
+                on_chunk(summary)
+    return summary
@@ -0,0 +1,105 @@
+# Typed, memory-mappable columnar copies of the bundled CSV datasets.
+# Each dataset becomes a directory of one .npy file per column (int8/int16 codes for categorical
+# columns, float32 for floats, the narrowest integer type for integers) plus meta.json holding
+# the column order and category vocabularies. Loading maps the files read-only, so the arrays
+# handed back are views onto the page cache rather than parsed copies.
+#
+#   python -m Services.DatasetStore                      # convert every CSV in datasets/
+#   python -m Services.DatasetStore datasets/mushrooms.csv
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from Services.CategoricalCodec import CategoricalCodec, code_dtype
+
+ROOT = Path(__file__).resolve().parent.parent
+DATASETS_DIR = ROOT / "datasets"
+STORE_DIR = DATASETS_DIR / "columnar"
+
+
+def store_path(name):
+    return STORE_DIR / Path(name).stem
+
+
+# ----------------------------- Conversion -----------------------------
+def numeric_array(series):
+    if pd.api.types.is_float_dtype(series):
+        return series.to_numpy(dtype=np.float32)
+    values = series.to_numpy()
+    low, high = values.min(initial=0), values.max(initial=0)
+    dtype = code_dtype(max(abs(int(low)), abs(int(high))))
+    return values.astype(dtype)
+
+
+def convert(csv_path, out_dir=None):
+    frame = pd.read_csv(csv_path)
+    # A leading unnamed column is a saved pandas index (cleanedDataframe.csv), not data
+    if frame.columns[0].startswith("Unnamed: 0"):
+        frame = frame.drop(columns=frame.columns[0])
+
+    out_dir = Path(out_dir) if out_dir else store_path(csv_path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    categorical = [col for col in frame.columns if not pd.api.types.is_numeric_dtype(frame[col])]
+    codec = CategoricalCodec()
+    codes = codec.fit_transform(frame[categorical]) if categorical else None
+
+    columns = []
+    for i, col in enumerate(frame.columns):
+        entry = {"name": col, "file": f"{i:03d}.npy"}
+        if col in categorical:
+            array = codes[col].to_numpy()
+            entry["categories"] = [str(value) for value in codec.vocabularies[col]]
+        else:
+            array = numeric_array(frame[col])
+        entry["dtype"] = str(array.dtype)
+        np.save(out_dir / entry["file"], np.ascontiguousarray(array), allow_pickle=False)
+        columns.append(entry)
+
+    meta = {"source": Path(csv_path).name, "rows": len(frame), "columns": columns}
+    (out_dir / "meta.json").write_text(json.dumps(meta, indent=1))
+    return out_dir
+
+
+# ----------------------------- Loading -----------------------------
+def read_meta(name):
+    return json.loads((store_path(name) / "meta.json").read_text())
+
+
+def load_columns(name):
+    # name -> read-only np.memmap; categorical columns stay as integer codes
+    directory = store_path(name)
+    meta = read_meta(name)
+    return {entry["name"]: np.load(directory / entry["file"], mmap_mode="r", allow_pickle=False)
+            for entry in meta["columns"]}
+
+
+def load_frame(name, decode=True):
+    # DataFrame whose columns are views over the memory-mapped files (copy=False keeps them unconsolidated).
+    # With decode=True categorical columns come back as pandas Categoricals over the same codes.
+    meta = read_meta(name)
+    arrays = load_columns(name)
+    data = {}
+    for entry in meta["columns"]:
+        array = arrays[entry["name"]]
+        if decode and "categories" in entry:
+            array = pd.Categorical.from_codes(array, categories=entry["categories"], validate=False)
+        data[entry["name"]] = array
+    return pd.DataFrame(data, copy=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert CSV datasets into memory-mappable column bundles")
+    parser.add_argument("csv", nargs="*", help="CSV files to convert (default: every CSV in datasets/)")
+    args = parser.parse_args(argv)
+
+    for csv_path in args.csv or sorted(DATASETS_DIR.glob("*.csv")):
+        out_dir = convert(csv_path)
+        size = sum(path.stat().st_size for path in out_dir.iterdir())
+        print(f"{csv_path} ({Path(csv_path).stat().st_size:,} bytes) -> {out_dir} ({size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
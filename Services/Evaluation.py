@@ -0,0 +1,75 @@
+# Test-set evaluation computed once per trained model and shared by every metric and chart.
+# predict() and the score function each run a single pass over x_test, once per (model, split)
+# key since ChartCache keeps the bundle. Labels always come from predict(), so the metrics agree with
+# the results table; SVC(probability=True), for one, predicts from its margins, not its Platt
+# probabilities. Curves are derived lazily from the scores.
+import hashlib
+from functools import cached_property
+
+import numpy as np
+from sklearn.metrics import (accuracy_score, auc, confusion_matrix, f1_score, precision_recall_curve,
+                             precision_score, recall_score, roc_curve)
+
+
+class EvaluationBundle:
+    def __init__(self, model, x_test, y_test, key=None):
+        # key identifies (model, test split) for ChartCache; without one the outputs are digested
+        self.key = key
+        self.y_test = np.asarray(y_test)
+        self.y_pred = model.predict(x_test)
+        if hasattr(model, "predict_proba"):
+            self.scores = model.predict_proba(x_test)[:, 1]
+        else:  # e.g. SVC without probability=True
+            self.scores = model.decision_function(x_test)
+
+    # ----------------------------- Summary Metrics -----------------------------
+    @cached_property
+    def accuracy(self):
+        return accuracy_score(self.y_test, self.y_pred)
+
+    @cached_property
+    def precision(self):
+        return precision_score(self.y_test, self.y_pred)
+
+    @cached_property
+    def recall(self):
+        return recall_score(self.y_test, self.y_pred)
+
+    @cached_property
+    def f1(self):
+        return f1_score(self.y_test, self.y_pred)
+
+    @cached_property
+    def confusion_matrix(self):
+        return confusion_matrix(self.y_test, self.y_pred)
+
+    # ----------------------------- Curves -----------------------------
+    @cached_property
+    def roc_curve(self):
+        fpr, tpr, thresholds = roc_curve(self.y_test, self.scores)
+        return fpr, tpr, thresholds, auc(fpr, tpr)
+
+    @cached_property
+    def precision_recall_curve(self):
+        return precision_recall_curve(self.y_test, self.scores)
+
+    @cached_property
+    def f1_curve(self):
+        precision, recall, thresholds = self.precision_recall_curve
+        with np.errstate(divide="ignore", invalid="ignore"):
+            f1_scores = 2 * (precision * recall) / (precision + recall)
+        return thresholds, f1_scores
+
+    # ----------------------------- Identity -----------------------------
+    @cached_property
+    def fingerprint(self):
+        # The caller's key when given; otherwise a digest of everything the metrics and charts are
+        # computed from: the test labels and the model's predictions and scores on them
+        if self.key is not None:
+            return self.key
+        digest = hashlib.blake2b(digest_size=16)
+        for array in (self.y_test, self.y_pred, self.scores):
+            array = np.ascontiguousarray(array)
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            digest.update(array.tobytes())
+        return digest.hexdigest()
@@ -0,0 +1,108 @@
+# Fit-once, transform-many preprocessing for the pickled models in Models/.
+# Reproduces datasets/cleanedDataframe.csv from raw datasets/mushrooms.csv rows:
+# label encoders -> StandardScaler over the cap/gill/stalk columns -> one PCA component per group.
+# Rebuild the persisted pipeline with:  python -m Services.FeaturePipeline
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+PIPELINE_PATH = ROOT / "Models" / "feature_pipeline.pkl"
+
+CAP_COLUMNS = ["cap_shape", "cap_surface", "cap_color"]
+GILL_COLUMNS = ["gill_attachment", "gill_spacing", "gill_size", "gill_color"]
+STALK_COLUMNS = ["stalk_shape", "stalk_root", "stalk_surface_above_ring", "stalk_surface_below_ring",
+                 "stalk_color_above_ring", "stalk_color_below_ring"]
+GROUPS = {"cap": CAP_COLUMNS, "gill": GILL_COLUMNS, "stalk": STALK_COLUMNS}
+PCA_COLUMNS = CAP_COLUMNS + GILL_COLUMNS + STALK_COLUMNS
+CODED_COLUMNS = ["bruises", "odor", "ring_number", "ring_type", "spore_print_color", "population", "habitat"]
+
+# Column order the pickled models were trained on (cleanedDataframe.csv without "class")
+MODEL_FEATURES = ["bruises", "odor", "ring-number", "ring-type", "spore-print-color", "population", "habitat",
+                  "cap", "gill", "stalk"]
+
+
+def normalize_columns(raw):
+    if isinstance(raw, dict):
+        raw = pd.DataFrame([raw])
+    return raw.rename(columns=lambda col: col.replace("-", "_"))
+
+
+class FeaturePipeline:
+    def __init__(self, encoders):
+        # Keep only the sorted LabelEncoder vocabularies; searchsorted gives the same codes without sklearn overhead
+        self.vocabularies = {col: np.asarray(encoder.classes_) for col, encoder in encoders.items()}
+        self.weights = None
+        self.bias = None
+
+    def encode(self, raw, columns):
+        encoded = np.empty((len(raw), len(columns)), dtype=np.float64)
+        for i, col in enumerate(columns):
+            vocabulary = self.vocabularies[col]
+            values = raw[col].to_numpy()
+            codes = np.searchsorted(vocabulary, values).clip(0, len(vocabulary) - 1)
+            if not (vocabulary[codes] == values).all():
+                raise ValueError(f"Unknown value(s) in column '{col}': {sorted(set(values) - set(vocabulary))}")
+            encoded[:, i] = codes
+        return encoded
+
+    def fit(self, raw):
+        from sklearn.decomposition import PCA
+        from sklearn.preprocessing import StandardScaler
+
+        encoded = self.encode(normalize_columns(raw), PCA_COLUMNS)
+        scaler = StandardScaler().fit(encoded)
+        scaled = scaler.transform(encoded)
+
+        # Fold the scaler and each group's PCA into one affine map: components = encoded @ weights + bias
+        self.weights = np.zeros((len(PCA_COLUMNS), len(GROUPS)))
+        self.bias = np.zeros(len(GROUPS))
+        offset = 0
+        for i, columns in enumerate(GROUPS.values()):
+            block = slice(offset, offset + len(columns))
+            offset += len(columns)
+            pca = PCA(n_components=1).fit(scaled[:, block])
+            component = pca.components_[0]
+            self.weights[block, i] = component / scaler.scale_[block]
+            self.bias[i] = -(scaler.mean_[block] / scaler.scale_[block] + pca.mean_) @ component
+        return self
+
+    def align_signs(self, raw, reference):
+        # PCA component signs are arbitrary; flip ours to match a reference projection
+        projected = self.project(self.encode(normalize_columns(raw), PCA_COLUMNS))
+        for i, group in enumerate(GROUPS):
+            if np.dot(projected[:, i], reference[group]) < 0:
+                self.weights[:, i] *= -1
+                self.bias[i] *= -1
+        return self
+
+    def project(self, encoded):
+        return encoded @ self.weights + self.bias
+
+    def transform(self, raw):
+        raw = normalize_columns(raw)
+        coded = self.encode(raw, CODED_COLUMNS)
+        components = self.project(self.encode(raw, PCA_COLUMNS))
+        return pd.DataFrame(np.hstack([coded, components]), columns=MODEL_FEATURES, index=raw.index)
+
+
+def build(raw_path=ROOT / "datasets" / "mushrooms.csv", reference_path=ROOT / "datasets" / "cleanedDataframe.csv"):
+    import joblib
+
+    raw = pd.read_csv(raw_path)
+    reference = pd.read_csv(reference_path, index_col=0)
+    pipeline = FeaturePipeline(joblib.load(ROOT / "Models" / "label_encoders.pkl"))
+    pipeline.fit(raw).align_signs(raw, reference)
+
+    drift = np.abs(pipeline.transform(raw).to_numpy() - reference[MODEL_FEATURES].to_numpy()).max()
+    joblib.dump(pipeline, PIPELINE_PATH)
+    return pipeline, drift
+
+
+if __name__ == "__main__":
+    # Re-import so the pickle references Services.FeaturePipeline rather than __main__
+    from Services.FeaturePipeline import build as build_pipeline
+
+    _, drift = build_pipeline()
+    print(f"Wrote {PIPELINE_PATH} (max deviation from cleanedDataframe.csv: {drift:.2e})")
@@ -0,0 +1,170 @@
+# Flat, memory-mappable export of sklearn tree ensembles with a vectorized NumPy predictor.
+# Every tree is appended to shared node arrays (feature, threshold, children, value) with absolute
+# child indices; children[node] is (right, left) so the comparison result indexes it directly.
+# Leaves have an infinite threshold. Traversal advances all (row, tree) pairs one level per step and
+# retires pairs as they reach a leaf. Thresholds are stored as float32 rounded down to the largest float32
+# not above the original: sklearn casts inputs to float32 before comparing, and for float32 x,
+# x <= t exactly when x <= that rounded threshold.
+# Leaf class fractions are stored as float16 when that still reproduces the sklearn predictions
+# on the check data, float32 otherwise.
+#
+#   python -m Services.FlatForest                        # export the bundled forests to Models/flat/
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from Services.CategoricalCodec import code_dtype
+
+FLAT_DIR = Path(__file__).resolve().parent.parent / "Models" / "flat"
+ARRAYS = ("feature", "threshold", "children", "value")
+VALUE_DTYPES = (np.float16, np.float32)
+BLOCK_ROWS = 512
+
+
+# ----------------------------- Export -----------------------------
+def float32_floor(values):
+    values = np.asarray(values, dtype=np.float64)
+    rounded = values.astype(np.float32)
+    above = rounded.astype(np.float64) > values
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def flatten(model):
+    # Node arrays for a fitted forest (or a single tree) plus the root index of each tree
+    trees = [estimator.tree_ for estimator in getattr(model, "estimators_", [model])]
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+    total = int(offsets[-1])
+    index_dtype = np.int32 if total < np.iinfo(np.int32).max else np.int64
+
+    feature = np.zeros(total, dtype=code_dtype(model.n_features_in_))
+    threshold = np.full(total, np.inf, dtype=np.float32)
+    children = np.zeros((total, 2), dtype=index_dtype)
+    value = np.zeros((total, len(model.classes_)), dtype=np.float64)
+    depth = 0
+    for tree, offset in zip(trees, offsets):
+        nodes = slice(offset, offset + tree.node_count)
+        split = tree.children_left != -1
+        positions = np.flatnonzero(split) + offset
+        feature[positions] = tree.feature[split]
+        threshold[positions] = float32_floor(tree.threshold[split])
+        children[positions, 0] = tree.children_right[split] + offset
+        children[positions, 1] = tree.children_left[split] + offset
+        counts = tree.value[:, 0, :]
+        value[nodes] = counts / np.maximum(counts.sum(axis=1, keepdims=True), np.finfo(np.float64).tiny)
+        depth = max(depth, tree.max_depth)
+    arrays = {"feature": feature, "threshold": threshold, "children": children, "value": value}
+    return arrays, offsets[:-1].astype(index_dtype), depth
+
+
+def export(model, out_dir, check=None):
+    # check: feature matrices the flat predictor has to reproduce model.predict on
+    arrays, roots, depth = flatten(model)
+    full_value = arrays["value"]
+    for value_dtype in VALUE_DTYPES:
+        arrays["value"] = full_value.astype(value_dtype)
+        flat = FlatForest(arrays, roots, depth, model.classes_)
+        if all(np.array_equal(flat.predict(x), model.predict(x)) for x in check or ()):
+            break
+    else:
+        arrays["value"] = full_value
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name in ARRAYS:
+        np.save(out_dir / f"{name}.npy", np.ascontiguousarray(arrays[name]), allow_pickle=False)
+    np.save(out_dir / "roots.npy", roots, allow_pickle=False)
+    meta = {"estimator": type(model).__name__, "n_features": int(model.n_features_in_), "depth": int(depth),
+            "classes": np.asarray(model.classes_).tolist(), "value_dtype": str(arrays["value"].dtype)}
+    (out_dir / "meta.json").write_text(json.dumps(meta, indent=1))
+    return out_dir
+
+
+# ----------------------------- Prediction -----------------------------
+class FlatForest:
+    def __init__(self, arrays, roots, depth, classes):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.children = arrays["children"]
+        self.value = arrays["value"]
+        self.roots = roots
+        self.depth = depth
+        self.classes_ = np.asarray(classes)
+        self.n_features_in_ = None
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text())
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode, allow_pickle=False) for name in ARRAYS}
+        roots = np.load(directory / "roots.npy", allow_pickle=False)
+        forest = cls(arrays, roots, meta["depth"], meta["classes"])
+        forest.n_features_in_ = meta["n_features"]
+        return forest
+
+    def leaves(self, x):
+        # (rows, trees) leaf node indices; x must already be float32
+        rows, width = x.shape
+        flat_x = x.ravel()
+        children = self.children.reshape(-1)
+        leaves = np.empty(rows * len(self.roots), dtype=np.intp)
+        pairs = np.arange(len(leaves))
+        nodes = np.tile(self.roots, rows)
+        offsets = np.repeat(np.arange(rows) * width, len(self.roots))
+        while len(nodes):
+            threshold = self.threshold[nodes]
+            done = threshold == np.inf  # only leaves carry an infinite threshold
+            if done.any():
+                leaves[pairs[done]] = nodes[done]
+                active = ~done
+                nodes, pairs, offsets, threshold = nodes[active], pairs[active], offsets[active], threshold[active]
+            go_left = flat_x[offsets + self.feature[nodes]] <= threshold
+            nodes = children[2 * nodes + go_left]
+        return leaves.reshape(rows, len(self.roots))
+
+    def predict_proba(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        proba = np.empty((len(x), len(self.classes_)), dtype=np.float64)
+        # Row blocks keep the (row, tree) working set small enough to stay in cache
+        for start in range(0, len(x), BLOCK_ROWS):
+            block = x[start:start + BLOCK_ROWS]
+            proba[start:start + len(block)] = self.value[self.leaves(block)].sum(axis=1, dtype=np.float64)
+        return proba / len(self.roots)
+
+    def predict(self, x):
+        return self.classes_[np.argmax(self.predict_proba(x), axis=1)]
+
+
+# ----------------------------- CLI -----------------------------
+def bundled_check_data():
+    # The bundled forests were fitted on the 10 model features; check on both datasets
+    import pandas as pd
+
+    from Services import ModelRegistry
+    from Services.FeaturePipeline import MODEL_FEATURES
+
+    root = FLAT_DIR.parent.parent / "datasets"
+    raw = pd.read_csv(root / "mushrooms.csv")
+    cleaned = pd.read_csv(root / "cleanedDataframe.csv")
+    return [ModelRegistry.get("feature_pipeline").transform(raw).to_numpy(), cleaned[MODEL_FEATURES].to_numpy()]
+
+
+def main(argv=None):
+    from Services import ModelRegistry
+
+    parser = argparse.ArgumentParser(description="Export the bundled tree ensembles to flat NumPy node arrays")
+    parser.parse_args(argv)
+    check = bundled_check_data()
+    forests = {"random_forest": ModelRegistry.get("random_forest"),
+               "models_all_random_forest": ModelRegistry.get("models_all")["random_forest"]}
+    for name, model in forests.items():
+        out_dir = export(model, FLAT_DIR / name, check)
+        size = sum(path.stat().st_size for path in out_dir.iterdir())
+        meta = json.loads((out_dir / "meta.json").read_text())
+        print(f"{name}: {out_dir} ({size:,} bytes, values {meta['value_dtype']}, depth {meta['depth']})")
+
+
+if __name__ == "__main__":
+    main()
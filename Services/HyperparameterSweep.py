@@ -0,0 +1,189 @@
+# Cross-validated hyperparameter sweeps for the ML Lab, pruned with successive halving.
+# Every configuration starts on a small slice of each training fold; after each rung only the best
+# 1/eta survive and get eta times more rows, until the last rung fits on the full folds. Fits run in
+# parallel through joblib and are yielded as they finish so the page can stream a leaderboard.
+# Fold indices and the encoded matrices are cached per dataset fingerprint; joblib memory-maps the
+# matrices into its workers, so they are not pickled once per fit.
+import itertools
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.model_selection import StratifiedKFold
+
+DEFAULT_FOLDS = 3
+DEFAULT_ETA = 3
+MIN_RESOURCE = 200
+CACHE_SIZE = 4
+
+
+# ----------------------------- Search Spaces -----------------------------
+class Choice:
+    def __init__(self, values):
+        self.values = list(values)
+
+    def grid(self, points):
+        return self.values
+
+    def sample(self, rng, n):
+        if not self.values:
+            raise ValueError("Cannot sample from an empty Choice")
+        return [self.values[i] for i in rng.integers(len(self.values), size=n)]
+
+
+class LogRange:
+    def __init__(self, low, high):
+        self.low, self.high = low, high
+
+    def grid(self, points):
+        return [float(value) for value in np.geomspace(self.low, self.high, points)]
+
+    def sample(self, rng, n):
+        return [float(value) for value in np.exp(rng.uniform(math.log(self.low), math.log(self.high), n))]
+
+
+class IntRange:
+    def __init__(self, low, high):
+        self.low, self.high = low, high
+
+    def grid(self, points):
+        return sorted({int(round(value)) for value in np.linspace(self.low, self.high, points)})
+
+    def sample(self, rng, n):
+        return [int(value) for value in rng.integers(self.low, self.high + 1, n)]
+
+
+def empty_dimensions(space):
+    # Names of Choice dimensions with nothing to choose from; such a space has no configurations
+    return [name for name, dimension in space.items() if isinstance(dimension, Choice) and not dimension.values]
+
+
+def grid(space, points=3):
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name].grid(points) for name in names))]
+
+
+def sample(space, n, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {name: dimension.sample(rng, n) for name, dimension in space.items()}
+    configs = [{name: columns[name][i] for name in space} for i in range(n)]
+    # Drop duplicates (small Choice spaces repeat quickly) while keeping the sampling order
+    return list({tuple(sorted(config.items())): config for config in configs}.values())
+
+
+# ----------------------------- Cached Folds -----------------------------
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _prepare(x, y, n_splits, seed):
+    x = np.ascontiguousarray(np.asarray(x, dtype=np.float32))
+    y = np.asarray(y)
+    rng = np.random.default_rng(seed)
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    # Train indices are pre-shuffled, so the first r of them are a random subsample for any budget r
+    folds = [(rng.permutation(train), test) for train, test in splitter.split(x, y)]
+    return x, y, folds
+
+
+def prepared(data_key, x, y, n_splits=DEFAULT_FOLDS, seed=0):
+    # (X, y, folds) for a dataset; each fold is (shuffled train indices, test indices).
+    # Without a data key nothing is cached.
+    if data_key is None:
+        return _prepare(x, y, n_splits, seed)
+    key = (data_key, n_splits, seed)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    x, y, folds = _prepare(x, y, n_splits, seed)
+    with _cache_lock:
+        _cache[key] = (x, y, folds)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return x, y, folds
+
+
+# ----------------------------- Successive Halving -----------------------------
+def _fit_score(config, estimator, params, x, y, train, test, resource):
+    # Runs in a joblib worker; x and y arrive as read-only memmaps
+    start = time.perf_counter()
+    model = estimator(**params).fit(x[train[:resource]], y[train[:resource]])
+    score = float(np.mean(model.predict(x[test]) == y[test]))
+    return config, score, time.perf_counter() - start
+
+
+class SuccessiveHalving:
+    def __init__(self, estimator, configs, x, y, fixed=None, data_key=None, n_splits=DEFAULT_FOLDS,
+                 eta=DEFAULT_ETA, min_resource=MIN_RESOURCE, n_jobs=-1):
+        self.estimator = estimator
+        self.configs = configs
+        self.fixed = fixed or {}
+        self.eta = eta
+        self.n_jobs = n_jobs
+        self.x, self.y, self.folds = prepared(data_key, x, y, n_splits)
+        max_resource = min(len(train) for train, _ in self.folds)
+        # floor(log_eta(configs)) + 1 rungs, counted in integers so exact powers of eta are not lost to rounding
+        rungs, remaining = 1, len(configs)
+        while remaining >= eta:
+            remaining //= eta
+            rungs += 1
+        first = max(min(min_resource, max_resource), max_resource // eta ** (rungs - 1))
+        self.budgets = [min(max_resource, first * eta ** rung) for rung in range(rungs)]
+        self.budgets[-1] = max_resource
+        self.rows = {i: {"config": i, **config, "rung": 0, "rows": 0, "folds": 0, "score": np.nan,
+                         "std": np.nan, "fit_seconds": 0.0, "status": "queued"}
+                     for i, config in enumerate(configs)}
+        self._scores = {}
+
+    @property
+    def total_fits(self):
+        total, alive = 0, len(self.configs)
+        for _ in self.budgets:
+            total += alive * len(self.folds)
+            alive = max(1, alive // self.eta)
+        return total
+
+    def run(self):
+        # Yields (config index, rung, fold score) as fits finish; the leaderboard is updated in place
+        alive = list(self.rows)
+        n_folds = len(self.folds)
+        with Parallel(n_jobs=self.n_jobs, return_as="generator_unordered") as parallel:
+            for rung, resource in enumerate(self.budgets):
+                for i in alive:
+                    self.rows[i].update(rung=rung, rows=resource, folds=0, status="running")
+                    self._scores[i] = []
+                results = parallel(delayed(_fit_score)(i, self.estimator, {**self.configs[i], **self.fixed},
+                                                       self.x, self.y, *self.folds[fold], resource)
+                                   for i in alive for fold in range(n_folds))
+                for i, score, seconds in results:
+                    scores = self._scores[i]
+                    scores.append(score)
+                    row = self.rows[i]
+                    row.update(folds=len(scores), score=float(np.mean(scores)), std=float(np.std(scores)),
+                               fit_seconds=row["fit_seconds"] + seconds)
+                    yield i, rung, score
+                alive.sort(key=lambda i: self.rows[i]["score"], reverse=True)
+                if rung == len(self.budgets) - 1:
+                    break
+                keep = max(1, len(alive) // self.eta)
+                for i in alive[keep:]:
+                    self.rows[i]["status"] = "pruned"
+                alive = alive[:keep]
+        for i in alive:
+            self.rows[i]["status"] = "finished"
+
+    def leaderboard(self):
+        # Deepest rung first, then best mean fold accuracy
+        board = pd.DataFrame(self.rows.values())
+        return board.sort_values(["rung", "score"], ascending=False, na_position="last").reset_index(drop=True)
+
+    def best(self):
+        finished = [row for row in self.rows.values() if row["status"] == "finished"]
+        if not finished:
+            return None
+        return self.configs[max(finished, key=lambda row: row["score"])["config"]]
@@ -0,0 +1,196 @@
+# Resized, recompressed derivatives of the photos in images/.
+# The originals are 0.2-3.5 MB camera JPEGs, far larger than any column they are shown in. A derivative
+# is built lazily the first time a (photo, width) pair is asked for: the JPEG is decoded at a reduced
+# DCT scale, downsized and re-encoded as a progressive JPEG, then written to images/derived/ under
+# <content hash>-<width>.jpg, so edits to a photo get new keys and every replica agrees on names.
+# Hot derivatives stay in a byte-bounded in-memory LRU; a rerun costs one stat() per photo.
+# JPEG output is deliberate: st.image passes JPEG bytes through untouched but re-encodes anything else.
+# Prebuild every width and print a size report with:  python -m Services.ImageCache
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from Services.LazyImport import lazy_import
+
+Image = lazy_import("PIL.Image")
+ImageOps = lazy_import("PIL.ImageOps")
+
+IMAGES_DIR = Path(__file__).resolve().parent.parent / "images"
+DERIVED_DIR = IMAGES_DIR / "derived"
+
+WIDTHS = (160, 320, 480, 640, 960, 1280)
+QUALITY = 80
+DEFAULT_BUDGET_MB = 32
+
+# Streamlit's centered layout: 730px of content, 1rem between columns. Widths are doubled for
+# high-density screens.
+CONTENT_WIDTH = 730
+COLUMN_GAP = 16
+PIXEL_DENSITY = 2
+
+
+def content_key(path):
+    digest = hashlib.blake2b(digest_size=12)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def column_width(columns, content_width=CONTENT_WIDTH):
+    return (content_width - COLUMN_GAP * (columns - 1)) / columns
+
+
+def width_for(columns, widths=WIDTHS, content_width=CONTENT_WIDTH):
+    # Smallest derivative that still fills one of `columns` equal columns on a high-density screen
+    needed = column_width(columns, content_width) * PIXEL_DENSITY
+    return next((width for width in widths if width >= needed), widths[-1])
+
+
+def render(path, width, quality=QUALITY):
+    with Image.open(path) as image:
+        # Let the JPEG decoder skip detail we are about to throw away; asking for width x width keeps
+        # both sides large enough whichever way EXIF says the photo is rotated
+        image.draft("RGB", (width, width))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+    if image.width > width:
+        image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=quality, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+class ImageCache:
+    def __init__(self, derived_dir=DERIVED_DIR, widths=WIDTHS, budget_bytes=DEFAULT_BUDGET_MB << 20,
+                 quality=QUALITY):
+        self.derived_dir = Path(derived_dir)
+        self.widths = tuple(sorted(widths))
+        self.budget_bytes = budget_bytes
+        self.quality = quality
+        self.lock = threading.Lock()
+        self.keys = {}  # resolved path -> (mtime_ns, size, content key)
+        self.memory = OrderedDict()  # (content key, width) -> JPEG bytes
+        self.memory_bytes = 0
+        self.build_locks = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.builds = 0
+        self.build_seconds = 0.0
+        self.evictions = 0
+
+    def key_for(self, path):
+        # Hashing a multi-megabyte original is only redone when its mtime or size changes
+        path = Path(path).resolve()
+        stat = path.stat()
+        with self.lock:
+            known = self.keys.get(path)
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+        key = content_key(path)
+        with self.lock:
+            self.keys[path] = (stat.st_mtime_ns, stat.st_size, key)
+        return key
+
+    def derived_path(self, key, width):
+        return self.derived_dir / f"{key}-{width}.jpg"
+
+    def _remember(self, entry, data):
+        with self.lock:
+            if entry in self.memory:
+                return
+            self.memory[entry] = data
+            self.memory_bytes += len(data)
+            while self.memory_bytes > self.budget_bytes and len(self.memory) > 1:
+                _, evicted = self.memory.popitem(last=False)
+                self.memory_bytes -= len(evicted)
+                self.evictions += 1
+
+    def thumbnail(self, path, width):
+        # JPEG bytes of `path` scaled to the smallest configured width >= `width` (never upscaled)
+        width = next((w for w in self.widths if w >= width), self.widths[-1])
+        key = self.key_for(path)
+        entry = (key, width)
+        with self.lock:
+            data = self.memory.get(entry)
+            if data is not None:
+                self.memory.move_to_end(entry)
+                self.hits += 1
+                return data
+            build_lock = self.build_locks.setdefault(entry, threading.Lock())
+
+        # One session builds a missing derivative while any others asking for it wait
+        with build_lock:
+            with self.lock:
+                data = self.memory.get(entry)
+            if data is not None:
+                return data
+            target = self.derived_path(key, width)
+            if target.exists():
+                data = target.read_bytes()
+                with self.lock:
+                    self.disk_hits += 1
+            else:
+                start = time.perf_counter()
+                data = render(path, width, self.quality)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                partial = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                partial.write_bytes(data)
+                os.replace(partial, target)
+                with self.lock:
+                    self.builds += 1
+                    self.build_seconds += time.perf_counter() - start
+            self._remember(entry, data)
+        with self.lock:
+            self.build_locks.pop(entry, None)
+        return data
+
+    def for_columns(self, path, columns):
+        return self.thumbnail(path, width_for(columns, self.widths))
+
+    def prebuild(self, paths=None):
+        for path in paths or sorted(IMAGES_DIR.glob("*.jpg")):
+            for width in self.widths:
+                self.thumbnail(path, width)
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.memory), "memory_bytes": self.memory_bytes,
+                    "budget_bytes": self.budget_bytes, "hits": self.hits, "disk_hits": self.disk_hits,
+                    "builds": self.builds, "build_seconds": self.build_seconds, "evictions": self.evictions}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    # MUSHROOM_IMAGE_CACHE_MB bounds the in-memory LRU; derivatives on disk are not bounded
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ImageCache(budget_bytes=int(os.environ.get("MUSHROOM_IMAGE_CACHE_MB", DEFAULT_BUDGET_MB)) << 20)
+    return _cache
+
+
+def get_cache_if_created():
+    # None until something has called get_cache(); never creates one (used by Telemetry's gauges)
+    return _cache
+
+
+if __name__ == "__main__":
+    cache = get_cache()
+    start = time.perf_counter()
+    cache.prebuild()
+    seconds = time.perf_counter() - start
+    print(f"{'image':<32}{'original':>12}" + "".join(f"{width:>9}w" for width in cache.widths))
+    for path in sorted(IMAGES_DIR.glob("*.jpg")):
+        key = cache.key_for(path)
+        sizes = [cache.derived_path(key, width).stat().st_size for width in cache.widths]
+        print(f"{path.name:<32}{path.stat().st_size:>12,}" + "".join(f"{size:>10,}" for size in sizes))
+    stats = cache.stats()
+    print(f"{stats['builds']} built in {stats['build_seconds']:.2f}s, {stats['disk_hits']} already on disk "
+          f"({seconds:.2f}s total)")
@@ -0,0 +1,223 @@
+# Local REST service for the pickled models and the rule-based checker.
+# Concurrent single-specimen requests are coalesced into micro-batches before predict_proba runs.
+#
+#   python -m Services.InferenceServer --port 8600 --batch-size 64 --batch-wait-ms 5
+#
+#   POST /predict/<model>        one specimen as JSON (columns of datasets/mushrooms.csv)
+#   POST /predict/<model>/bulk   JSON lines in, JSON lines out (streamed; bad lines get {"line", "error"})
+#   POST /rules                  {"odor": "n", "bruises": "t", ...} -> rule-based verdict
+#   GET  /models, GET /health
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+from flask import Flask, Response, jsonify, request
+
+from Services import ModelRegistry
+from Services.BatchScorer import SCORING_MODELS
+from Services.RuleEngine import FEATURES
+from Services.RuleTable import classify_codes
+
+BULK_CHUNK_ROWS = 1000
+BULK_READ_BYTES = 1 << 20
+
+
+def score_specimens(model, specimens):
+    features = ModelRegistry.get("feature_pipeline").transform(pd.DataFrame(specimens)).to_numpy()
+    probabilities = model.predict_proba(features)[:, 1]
+    return [{"prediction": "Poisonous" if p >= 0.5 else "Edible", "probability_poisonous": round(float(p), 6)}
+            for p in probabilities]
+
+
+def score_bulk(model, entries):
+    # entries: [(line number, specimen dict or error message)]. One result per entry, in order; a bad
+    # line or specimen gets {"line": n, "error": ...} instead of aborting the whole response.
+    valid = [specimen for _, specimen in entries if isinstance(specimen, dict)]
+    try:
+        scored = iter(score_specimens(model, valid))
+    except Exception:
+        scored = None
+    results = []
+    for line, specimen in entries:
+        if not isinstance(specimen, dict):
+            results.append({"line": line, "error": specimen})
+        elif scored is not None:
+            results.append(next(scored))
+        else:
+            # The batch failed on some specimen: score one by one so only the bad ones report an error
+            try:
+                results.append(score_specimens(model, [specimen])[0])
+            except Exception as exc:
+                results.append({"line": line, "error": str(exc)})
+    return results
+
+
+def parse_line(line):
+    try:
+        specimen = json.loads(line)
+    except ValueError as exc:
+        return f"Invalid JSON: {exc}"
+    return specimen if isinstance(specimen, dict) else "Expected a JSON object describing one specimen"
+
+
+# ----------------------------- Micro-Batching -----------------------------
+class MicroBatcher:
+    # Collects requests until max_batch_size is reached or max_wait_ms has passed since the first one
+    # arrived, then scores them with one predict_proba call on a single background thread.
+    def __init__(self, model, max_batch_size=64, max_wait_ms=5.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.pending = queue.Queue()
+        self.batches = 0
+        self.items = 0
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, specimen):
+        future = Future()
+        self.pending.put((specimen, future))
+        return future
+
+    def _collect(self):
+        batch = [self.pending.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.pending.get(timeout=remaining) if remaining > 0 else self.pending.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            specimens = [specimen for specimen, _ in batch]
+            try:
+                results = score_specimens(self.model, specimens)
+            except Exception:
+                # Fall back to one-by-one so a single bad specimen only fails its own request
+                for specimen, future in batch:
+                    try:
+                        future.set_result(score_specimens(self.model, [specimen])[0])
+                    except Exception as exc:
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+# ----------------------------- Flask App -----------------------------
+def create_app(max_batch_size=64, max_wait_ms=5.0, models=SCORING_MODELS):
+    app = Flask(__name__)
+    batchers = {}
+    batchers_lock = threading.Lock()
+
+    def batcher_for(name):
+        if name not in models:
+            return None
+        with batchers_lock:
+            if name not in batchers:
+                batchers[name] = MicroBatcher(ModelRegistry.get(name), max_batch_size, max_wait_ms)
+            return batchers[name]
+
+    @app.get("/health")
+    def health():
+        return jsonify(status="ok")
+
+    @app.get("/models")
+    def list_models():
+        stats = {row["name"]: row for row in ModelRegistry.stats()}
+        return jsonify(models=[{"name": name, "loaded": name in stats,
+                                "batches": batchers[name].batches if name in batchers else 0,
+                                "items": batchers[name].items if name in batchers else 0}
+                               for name in models])
+
+    @app.post("/predict/<name>")
+    def predict(name):
+        batcher = batcher_for(name)
+        if batcher is None:
+            return jsonify(error=f"Unknown model '{name}'"), 404
+        specimen = request.get_json(silent=True)
+        if not isinstance(specimen, dict):
+            return jsonify(error="Expected a JSON object describing one specimen"), 400
+        try:
+            return jsonify(batcher.submit(specimen).result())
+        except (KeyError, ValueError, TypeError) as exc:
+            return jsonify(error=str(exc)), 400
+
+    @app.post("/predict/<name>/bulk")
+    def predict_bulk(name):
+        if name not in models:
+            return jsonify(error=f"Unknown model '{name}'"), 404
+        model = ModelRegistry.get(name)
+        stream = request.stream
+
+        def lines():
+            # Read the body in large blocks: iterating a werkzeug stream line by line costs ~0.5ms per line
+            tail = b""
+            while block := stream.read(BULK_READ_BYTES):
+                *complete, tail = (tail + block).split(b"\n")
+                yield from complete
+            yield tail
+
+        def generate():
+            chunk = []
+            for number, line in enumerate(lines(), 1):
+                if line.strip():
+                    chunk.append((number, parse_line(line)))
+                if len(chunk) == BULK_CHUNK_ROWS:
+                    yield "".join(json.dumps(result) + "\n" for result in score_bulk(model, chunk))
+                    chunk = []
+            if chunk:
+                yield "".join(json.dumps(result) + "\n" for result in score_bulk(model, chunk))
+
+        return Response(generate(), mimetype="application/x-ndjson")
+
+    @app.post("/rules")
+    def rules():
+        payload = request.get_json(silent=True)
+        specimens = payload if isinstance(payload, list) else [payload]
+        if not specimens:
+            return jsonify(error="Expected at least one specimen"), 400
+        if not all(isinstance(specimen, dict) for specimen in specimens):
+            return jsonify(error="Expected a JSON object or a list of objects"), 400
+        for i, specimen in enumerate(specimens):
+            missing = [name for name in FEATURES if name not in specimen]
+            if missing:
+                return jsonify(error=f"Specimen {i}: missing {', '.join(missing)}"), 400
+            wrong = [name for name in FEATURES if not isinstance(specimen[name], str)]
+            if wrong:
+                return jsonify(error=f"Specimen {i}: {', '.join(wrong)} must be letter codes given as strings"), 400
+        codes = np.array([[specimen[name] for name in FEATURES] for specimen in specimens], dtype=object)
+        verdicts = classify_codes(codes).tolist()
+        return jsonify(verdicts if isinstance(payload, list) else {"prediction": verdicts[0]})
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the mushroom models over HTTP with micro-batching")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--batch-size", type=int, default=64, help="Largest micro-batch passed to predict_proba")
+    parser.add_argument("--batch-wait-ms", type=float, default=5.0, help="How long the first request waits for company")
+    args = parser.parse_args(argv)
+
+    from werkzeug.serving import WSGIRequestHandler
+
+    # HTTP/1.1 so clients can keep connections alive between requests
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
+    ModelRegistry.preload(list(SCORING_MODELS) + ["feature_pipeline"])
+    create_app(args.batch_size, args.batch_wait_ms).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
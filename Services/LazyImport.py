@@ -0,0 +1,33 @@
+# Deferred imports for the page modules.
+# lazy_import("sklearn.svm") returns a stand-in that imports the real module on first attribute
+# access, so a page only pays for scipy, sklearn, matplotlib or pandas once a code path actually
+# uses them, not when Main.py first imports the page. Attributes come straight from the real module,
+# so classes fetched through a proxy keep their identity (pickling and model cache keys still work).
+#
+#   svm = lazy_import("sklearn.svm")    # nothing imported yet
+#   model = svm.SVC(C=1.0)              # sklearn.svm imported here
+import importlib
+
+
+class LazyModule:
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
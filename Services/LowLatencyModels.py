@@ -0,0 +1,25 @@
+# Engine choices for the ML Lab's KNN and Naive Bayes classifiers.
+# On letter-coded uploads (mushrooms.csv) every feature is categorical, so KNN searches a BallTree
+# under Hamming distance (the share of attributes that differ, i.e. one-hot L1 distance / 2) and
+# Naive Bayes is CategoricalNB, which fits by counting codes once. Numeric uploads keep the
+# Euclidean KD-tree and GaussianNB.
+import pandas as pd
+from sklearn.naive_bayes import CategoricalNB, GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+
+
+def is_categorical(frame):
+    return all(not pd.api.types.is_numeric_dtype(frame[col]) for col in frame.columns)
+
+
+def knn(n_neighbors, categorical):
+    if categorical:
+        return KNeighborsClassifier, dict(n_neighbors=n_neighbors, algorithm='ball_tree', metric='hamming')
+    return KNeighborsClassifier, dict(n_neighbors=n_neighbors, algorithm='kd_tree')
+
+
+def naive_bayes(categorical, category_counts=None):
+    # category_counts: vocabulary size per feature, so codes unseen in the training split stay valid
+    if categorical:
+        return CategoricalNB, dict(min_categories=list(category_counts) if category_counts is not None else None)
+    return GaussianNB, dict()
@@ -0,0 +1,137 @@
+# Cache of trained ML Lab models keyed by (dataset fingerprint, classifier, hyperparameters).
+# The memory tier is an LRU bounded by the estimated in-memory size of the models it holds (their
+# array buffers, see model_nbytes); the optional disk tier (set MUSHROOM_MODEL_CACHE_DIR) keeps
+# joblib files that survive restarts.
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+DEFAULT_MEMORY_BYTES = 512 * 1024 * 1024
+
+
+def fingerprint(data):
+    # Digest of raw upload bytes (or any bytes-like object); cheap next to hashing a DataFrame
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def model_key(data_fingerprint, estimator, params):
+    payload = json.dumps({"data": data_fingerprint, "estimator": f"{estimator.__module__}.{estimator.__name__}",
+                          "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def model_nbytes(obj, seen=None):
+    # Walks a fitted model's attributes and adds up its arrays' nbytes (coef_, support_vectors_, the
+    # node and value arrays behind each tree_, ...) plus the shallow size of everything else. Unlike
+    # sizing a pickle.dumps copy, nothing is serialised, so a 500-tree forest is sized in milliseconds.
+    if seen is None:
+        seen = {}
+    if id(obj) in seen:
+        return 0
+    seen[id(obj)] = obj  # held so the id of a temporary __getstate__ dict is not reused mid-walk
+    if isinstance(obj, np.ndarray):
+        size = obj.nbytes
+        if obj.dtype == object:
+            size += sum(model_nbytes(item, seen) for item in obj.flat)
+        return size
+    if isinstance(obj, (str, bytes, int, float, complex, bool, type(None), type, np.generic)):
+        return sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(model_nbytes(item, seen) for item in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(model_nbytes(k, seen) + model_nbytes(v, seen) for k, v in obj.items())
+    # Extension types such as sklearn's Tree keep their arrays out of __dict__ but hand them to
+    # __getstate__ for pickling (as views, not copies)
+    try:
+        state = obj.__getstate__()
+    except Exception:
+        state = getattr(obj, "__dict__", None)
+    return sys.getsizeof(obj) + (model_nbytes(state, seen) if state is not None else 0)
+
+
+class ModelCache:
+    def __init__(self, max_bytes=DEFAULT_MEMORY_BYTES, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self.entries = OrderedDict()  # key -> (model, size in bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def _disk_path(self, key):
+        return self.disk_dir / f"{key}.joblib"
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+        if self.disk_dir and self._disk_path(key).exists():
+            model = joblib.load(self._disk_path(key))
+            self._remember(key, model)
+            with self.lock:
+                self.hits += 1
+            return model
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def _remember(self, key, model):
+        size = model_nbytes(model)
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= self.entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self.entries[key] = (model, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def put(self, key, model):
+        self._remember(key, model)
+        if self.disk_dir:
+            joblib.dump(model, self._disk_path(key))
+
+    def fit(self, data_fingerprint, estimator, params, x_train, y_train):
+        key = model_key(data_fingerprint, estimator, params)
+        model = self.get(key)
+        if model is None:
+            model = estimator(**params).fit(x_train, y_train)
+            self.put(key, model)
+        return model
+
+    def stats(self):
+        with self.lock:
+            return {"models": len(self.entries), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            max_mb = int(os.environ.get("MUSHROOM_MODEL_CACHE_MB", DEFAULT_MEMORY_BYTES // (1024 * 1024)))
+            _cache = ModelCache(max_mb * 1024 * 1024, os.environ.get("MUSHROOM_MODEL_CACHE_DIR"))
+    return _cache
+
+
+def get_cache_if_created():
+    # None until something has called get_cache(); never creates one (used by Telemetry's gauges)
+    return _cache
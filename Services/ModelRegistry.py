@@ -0,0 +1,121 @@
+# Process-wide registry for the pickled artifacts in Models/.
+# Each artifact is unpickled once per process and the same instance is handed to every caller,
+# so treat what get() returns as read-only: never call fit() or set attributes on it.
+# Print a load report with:  python -m Services.ModelRegistry
+import os
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import joblib
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "Models"
+
+ARTIFACTS = {
+    "logistic_regression": "logistic_regression_model.pkl",
+    "random_forest": "random_forest_model.pkl",
+    "svm": "svm_model.pkl",
+    "pca": "pca_model.pkl",
+    "label_encoders": "label_encoders.pkl",
+    "models_all": "models_all.pkl",
+    "feature_pipeline": "feature_pipeline.pkl",
+    # Directories of flat node arrays written by python -m Services.FlatForest
+    "random_forest_flat": "flat/random_forest",
+}
+
+# SVC.predict_proba passes its support vectors to libsvm as writable Cython buffers, so anything
+# holding an SVC has to be loaded onto the heap rather than memory-mapped read-only
+HEAP_ONLY = {"svm", "models_all"}
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+_artifacts = {}
+_stats = {}
+_lock = threading.Lock()
+_name_locks = {name: threading.Lock() for name in ARTIFACTS}
+
+
+def path_for(name):
+    if name not in ARTIFACTS:
+        raise KeyError(f"Unknown model '{name}'. Available: {', '.join(ARTIFACTS)}")
+    return MODELS_DIR / ARTIFACTS[name]
+
+
+def _rss_bytes():
+    # Current resident set size on Linux; None elsewhere
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _load(name):
+    path = path_for(name)
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    if path.is_dir():
+        from Services.FlatForest import FlatForest
+        artifact = FlatForest.load(path)
+    else:
+        # Arrays inside joblib pickles are memory-mapped read-only instead of copied onto the heap
+        artifact = joblib.load(path, mmap_mode=None if name in HEAP_ONLY else "r")
+    seconds = time.perf_counter() - start
+    rss_after = _rss_bytes()
+
+    # The first artifact of a given estimator type also pays for importing its sklearn modules
+    _stats[name] = {
+        "name": name,
+        "path": str(path),
+        "file_bytes": sum(f.stat().st_size for f in path.iterdir()) if path.is_dir() else path.stat().st_size,
+        # Process-wide, so a concurrent load elsewhere can inflate it; memory-mapped arrays only count
+        # once their pages are touched
+        "rss_bytes": max(rss_after - rss_before, 0) if rss_before is not None else None,
+        "load_seconds": seconds,
+    }
+    return artifact
+
+
+def get(name):
+    if name in _artifacts:
+        return _artifacts[name]
+    path_for(name)
+    # Per-artifact lock: concurrent first requests wait for a single load instead of racing
+    with _name_locks[name]:
+        if name not in _artifacts:
+            artifact = _load(name)
+            with _lock:
+                _artifacts[name] = artifact
+    return _artifacts[name]
+
+
+def preload(names=None):
+    for name in names or ARTIFACTS:
+        get(name)
+
+
+def stats():
+    with _lock:
+        return [dict(_stats[name]) for name in ARTIFACTS if name in _stats]
+
+
+def clear():
+    with _lock:
+        _artifacts.clear()
+        _stats.clear()
+
+
+if __name__ == "__main__":
+    # Footprint report: Python heap allocations are traced here only, never on the app's load path
+    tracemalloc.start()
+    heap = {}
+    for name in ARTIFACTS:
+        before = tracemalloc.get_traced_memory()[0]
+        get(name)
+        heap[name] = max(tracemalloc.get_traced_memory()[0] - before, 0)
+    tracemalloc.stop()
+    print(f"{'artifact':<22}{'file':>12}{'heap':>12}{'rss':>12}{'load':>10}")
+    for row in stats():
+        print(f"{row['name']:<22}{row['file_bytes']:>12,}{heap[row['name']]:>12,}{row['rss_bytes'] or 0:>12,}"
+              f"{row['load_seconds'] * 1000:>8.1f}ms")
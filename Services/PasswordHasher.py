@@ -0,0 +1,116 @@
+# Password hashing and verification off the Streamlit script threads.
+# werkzeug's pbkdf2 runs in hashlib, which releases the GIL, so a small thread pool keeps a burst of
+# logins from stalling every other rerun in the process. Admission is bounded: at most
+# workers + max_queue hashes are in flight or waiting, and anything beyond that is refused
+# immediately with HasherBusy rather than queued without limit. A hash that is not done within
+# `timeout` seconds also surfaces as HasherBusy, and is dropped if it had not started yet.
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from Services.LazyImport import lazy_import
+
+# Imported on the first hash so the login page renders without them
+np = lazy_import("numpy")
+security = lazy_import("werkzeug.security")
+
+HASH_METHOD = "pbkdf2:sha256"
+DEFAULT_MAX_QUEUE = 32
+LATENCY_WINDOW = 1024
+
+
+class HasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, workers=None, max_queue=DEFAULT_MAX_QUEUE, timeout=30.0):
+        self.workers = workers or max(1, min(4, os.cpu_count() or 1))
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        self.slots = threading.BoundedSemaphore(self.workers + max_queue)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.hash_seconds = deque(maxlen=LATENCY_WINDOW)  # time spent hashing
+        self.wait_seconds = deque(maxlen=LATENCY_WINDOW)  # time queued before a worker picked it up
+
+    def _run(self, func, *args):
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            raise HasherBusy(f"{self.workers + self.max_queue} password hashes already in flight")
+        with self.lock:
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished = time.perf_counter()
+                with self.lock:
+                    self.pending -= 1
+                    self.completed += 1
+                    self.wait_seconds.append(started - submitted)
+                    self.hash_seconds.append(finished - started)
+                self.slots.release()
+
+        future = self.pool.submit(task)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            cancelled = future.cancel()
+            with self.lock:
+                self.timed_out += 1
+                if cancelled:  # never started, so task() will not hand its slot back
+                    self.pending -= 1
+            if cancelled:
+                self.slots.release()
+            raise HasherBusy(f"Password hash not finished within {self.timeout:g}s") from None
+
+    def hash(self, password, method=HASH_METHOD):
+        return self._run(security.generate_password_hash, password, method)
+
+    def verify(self, hashed_password, password):
+        return self._run(security.check_password_hash, hashed_password, password)
+
+    def stats(self):
+        with self.lock:
+            hash_ms = np.array(self.hash_seconds) * 1000
+            wait_ms = np.array(self.wait_seconds) * 1000
+            stats = {"workers": self.workers, "max_queue": self.max_queue, "in_flight": self.pending,
+                     "queue_depth": max(0, self.pending - self.workers), "max_in_flight": self.max_pending,
+                     "completed": self.completed, "rejected": self.rejected, "timed_out": self.timed_out}
+        for name, values in (("hash_ms", hash_ms), ("wait_ms", wait_ms)):
+            if len(values):
+                stats[f"{name}_p50"], stats[f"{name}_p95"] = np.percentile(values, [50, 95]).tolist()
+        return stats
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def get_hasher():
+    # MUSHROOM_HASH_WORKERS / MUSHROOM_HASH_QUEUE size the process-wide pool
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHasher(int(os.environ.get("MUSHROOM_HASH_WORKERS", 0)) or None,
+                                     int(os.environ.get("MUSHROOM_HASH_QUEUE", DEFAULT_MAX_QUEUE)))
+    return _hasher
+
+
+def get_hasher_if_created():
+    # None until something has called get_hasher(); never creates one (used by Telemetry's gauges)
+    return _hasher
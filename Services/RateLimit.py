@@ -0,0 +1,76 @@
+# Token-bucket rate limiting for the login and signup forms.
+# Buckets are keyed by username or client IP and refill continuously; a request that finds its
+# bucket empty is refused before any password hash is computed. Idle buckets are dropped so the
+# table does not grow with every username an attacker tries.
+import threading
+import time
+
+PRUNE_EVERY = 1024
+
+
+class RateLimited(Exception):
+    def __init__(self, scope, retry_after):
+        super().__init__(f"Too many attempts for this {scope}; try again in {retry_after:.0f}s")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    def __init__(self, scope, per_minute, burst):
+        self.scope = scope
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.buckets = {}  # key -> (tokens, last refill time)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.refused = 0
+
+    def _tokens(self, key, now):
+        tokens, last = self.buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - last) * self.rate)
+
+    def check(self, key):
+        # Takes one token for key or raises RateLimited
+        now = time.monotonic()
+        with self.lock:
+            self.calls += 1
+            if self.calls % PRUNE_EVERY == 0:
+                self._prune(now)
+            tokens = self._tokens(key, now)
+            if tokens < 1:
+                self.refused += 1
+                self.buckets[key] = (tokens, now)
+                raise RateLimited(self.scope, (1 - tokens) / self.rate)
+            self.buckets[key] = (tokens - 1, now)
+
+    def _prune(self, now):
+        # A bucket that has refilled completely carries no state worth keeping
+        full = [key for key in self.buckets if self._tokens(key, now) >= self.burst]
+        for key in full:
+            del self.buckets[key]
+
+    def stats(self):
+        with self.lock:
+            return {"scope": self.scope, "tracked": len(self.buckets), "calls": self.calls, "refused": self.refused}
+
+
+# Limits for Main.py's forms: a user gets a handful of login attempts, an address somewhat more
+LOGIN_PER_USER = RateLimiter("user", per_minute=5, burst=5)
+LOGIN_PER_IP = RateLimiter("address", per_minute=30, burst=10)
+SIGNUP_PER_IP = RateLimiter("address", per_minute=5, burst=3)
+
+
+def check_login(username, ip_address=None):
+    if ip_address:
+        LOGIN_PER_IP.check(ip_address)
+    LOGIN_PER_USER.check(username.lower())
+
+
+def check_signup(ip_address=None):
+    if ip_address:
+        SIGNUP_PER_IP.check(ip_address)
+
+
+def stats():
+    return {"login_per_user": LOGIN_PER_USER.stats(), "login_per_ip": LOGIN_PER_IP.stats(),
+            "signup_per_ip": SIGNUP_PER_IP.stats()}
@@ -0,0 +1,65 @@
+# Server-side paging for the ML Lab results table.
+# Predictions are kept as an int8 array next to the uploaded frame instead of a copied frame with a
+# string column. Sort orders are argsorted once per column and cached, filters are boolean masks
+# over those orders, and only the requested window is materialized, so what reaches st.dataframe
+# is one page however many rows were scored.
+import numpy as np
+import pandas as pd
+
+PREDICTION_COLUMN = "Prediction"
+PREDICTION_LABELS = np.array(["Edible", "Poisonous"], dtype=object)
+FILTERS = {"All": None, "Edible": 0, "Poisonous": 1}
+
+
+class ResultsPager:
+    def __init__(self, frame, predictions):
+        self.frame = frame
+        self.predictions = np.asarray(predictions).astype(np.int8, copy=False)
+        self._orders = {}
+        self._last = None
+
+    def __len__(self):
+        return len(self.predictions)
+
+    @property
+    def columns(self):
+        # An uploaded column that is already called Prediction is replaced by the model's one
+        return [PREDICTION_COLUMN, *(col for col in self.frame.columns if col != PREDICTION_COLUMN)]
+
+    def counts(self):
+        poisonous = int(np.count_nonzero(self.predictions == 1))
+        return len(self) - poisonous, poisonous
+
+    def order(self, column):
+        # Stable ascending row order for a column, computed on first use
+        if column not in self._orders:
+            if column == PREDICTION_COLUMN:
+                keys = self.predictions
+            else:
+                keys = pd.factorize(self.frame[column], sort=True, use_na_sentinel=False)[0]
+            self._orders[column] = np.argsort(keys, kind="stable")
+        return self._orders[column]
+
+    def query(self, prediction=None, sort_by=None, ascending=True):
+        # Positions of the matching rows in display order; the last query is kept for page flips
+        key = (prediction, sort_by, ascending)
+        if self._last is not None and self._last[0] == key:
+            return self._last[1]
+        rows = self.order(sort_by) if sort_by else np.arange(len(self), dtype=np.intp)
+        if prediction is not None:
+            rows = rows[self.predictions[rows] == prediction]
+        if not ascending:
+            rows = rows[::-1]
+        self._last = (key, rows)
+        return rows
+
+    def page(self, rows, number, size):
+        # Rows of page `number` (0-based) with the decoded prediction in front
+        window = rows[number * size:(number + 1) * size]
+        page = self.frame.iloc[window].drop(columns=[PREDICTION_COLUMN], errors="ignore")
+        page.insert(0, PREDICTION_COLUMN, PREDICTION_LABELS[self.predictions[window]])
+        return page
+
+
+def page_count(total, size):
+    return max(1, -(-total // size))
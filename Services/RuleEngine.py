@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+# Feature order used by classify_mushroom and by every batch helper below
+FEATURES = ("odor", "bruises", "gill_color", "cap_shape", "cap_surface", "cap_color")
+VERDICTS = np.array(["Poisonous", "Edible"], dtype=object)
+
+# Letter codes offered by the Edibility Checker for each feature
+CODES = {
+    "odor": ("a", "c", "f", "l", "m", "n", "p", "s", "y"),
+    "bruises": ("f", "t"),
+    "gill_color": ("b", "e", "g", "h", "k", "n", "o", "p", "r", "u", "w", "y"),
+    "cap_shape": ("b", "c", "f", "k", "s", "x"),
+    "cap_surface": ("f", "g", "s", "y"),
+    "cap_color": ("b", "c", "e", "g", "n", "p", "r", "u", "w", "y"),
+}
+
+
+# ----------------------------- Per-Specimen Rules -----------------------------
+def classify_mushroom(odor, bruises, gill_color, cap_shape, cap_surface, cap_color):
+    match (odor, bruises, gill_color, cap_shape, cap_surface, cap_color):
+        case ("f" | "y" | "c" | "m" | "p" | "s", _, _, _, _, _):
+            return "Poisonous"
+        case ("n", "t", _, _, _, "w" | "g" | "n"):
+            return "Edible"
+        case ("n", _, "b" | "p" | "u", _, _, _):
+            return "Edible"
+        case ("a", _, "b" | "p" | "u", _, _, _):
+            return "Edible"
+        case ("n", _, _, "x" | "f", "s", _):
+            return "Edible"
+        case (_, "f", _, "b" | "c", "y" | "f", _):
+            return "Poisonous"
+        case _:
+            return "Poisonous"
+
+
+# ----------------------------- Vectorized Rules -----------------------------
+def edible_mask(odor, bruises, gill_color, cap_shape, cap_surface, cap_color):
+    # Same cascade as classify_mushroom, evaluated column-wise. Every "Edible" case
+    # requires odor "n" or "a", so the leading "Poisonous" odors never need their own mask.
+    odor = np.asarray(odor)
+    odor_none = odor == "n"
+    odor_almond = odor == "a"
+    gill_pale = np.isin(gill_color, ("b", "p", "u"))
+
+    return (
+        (odor_none & (np.asarray(bruises) == "t") & np.isin(cap_color, ("w", "g", "n")))
+        | (odor_none & gill_pale)
+        | (odor_almond & gill_pale)
+        | (odor_none & np.isin(cap_shape, ("x", "f")) & (np.asarray(cap_surface) == "s"))
+    )
+
+
+def _feature_columns(features):
+    if isinstance(features, pd.DataFrame):
+        missing = [name for name in FEATURES if name not in features.columns]
+        if missing:
+            raise KeyError(f"Missing feature columns: {', '.join(missing)}")
+        return [features[name].to_numpy() for name in FEATURES]
+
+    features = np.asarray(features)
+    if features.ndim != 2 or features.shape[1] != len(FEATURES):
+        raise ValueError(f"Expected an (n, {len(FEATURES)}) array ordered as {FEATURES}")
+    return [features[:, i] for i in range(len(FEATURES))]
+
+
+def classify_batch(features):
+    # Accepts a DataFrame with the FEATURES columns (e.g. datasets/mushrooms.csv)
+    # or an (n, 6) array of letter codes, and returns an array of verdict strings.
+    return VERDICTS[edible_mask(*_feature_columns(features)).astype(np.intp)]
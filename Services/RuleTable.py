@@ -0,0 +1,90 @@
+# Precompiled lookup table for the rule-based Edibility Checker.
+# Build it once with:  python -m Services.RuleTable
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from Services.RuleEngine import CODES, FEATURES, VERDICTS, _feature_columns, classify_batch
+
+TABLE_PATH = Path(__file__).resolve().parent.parent / "Models" / "rule_table.npy"
+
+# Mixed-radix layout: odor is the most significant digit, cap_color the least
+RADICES = tuple(len(CODES[name]) for name in FEATURES)
+STRIDES = tuple(int(np.prod(RADICES[i + 1:], dtype=np.int64)) for i in range(len(RADICES)))
+DOMAIN_SIZE = int(np.prod(RADICES, dtype=np.int64))
+
+_CODE_INDEX = {name: {code: i for i, code in enumerate(CODES[name])} for name in FEATURES}
+_table = None
+_table_lock = threading.Lock()
+
+
+# ----------------------------- Build Step -----------------------------
+def build_table():
+    # Enumerate every combination in mixed-radix order and run it through the rule cascade
+    digits = np.indices(RADICES).reshape(len(RADICES), -1)
+    letters = np.column_stack([np.array(CODES[name], dtype=object)[digits[i]] for i, name in enumerate(FEATURES)])
+    return (classify_batch(letters) == "Edible").astype(np.uint8)
+
+
+def save_table(path=TABLE_PATH):
+    table = build_table()
+    np.save(path, table, allow_pickle=False)
+    return table
+
+
+def load_table(path=TABLE_PATH):
+    # Memory-mapped read-only, so every worker process shares the same page-cache copy
+    table = np.load(path, mmap_mode="r", allow_pickle=False)
+    if table.shape != (DOMAIN_SIZE,) or table.dtype != np.uint8:
+        raise ValueError(f"{path} does not match the current rule domain; rebuild it with python -m Services.RuleTable")
+    return table
+
+
+def get_table():
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = load_table() if TABLE_PATH.exists() else build_table()
+    return _table
+
+
+# ----------------------------- Lookups -----------------------------
+def encode(odor, bruises, gill_color, cap_shape, cap_surface, cap_color):
+    codes = (odor, bruises, gill_color, cap_shape, cap_surface, cap_color)
+    return sum(_CODE_INDEX[name][code] * stride for name, code, stride in zip(FEATURES, codes, STRIDES))
+
+
+def lookup(odor, bruises, gill_color, cap_shape, cap_surface, cap_color):
+    try:
+        index = encode(odor, bruises, gill_color, cap_shape, cap_surface, cap_color)
+    except KeyError:
+        # Codes outside the checker's domain still go through the full cascade
+        return classify_batch([[odor, bruises, gill_color, cap_shape, cap_surface, cap_color]])[0]
+    return VERDICTS[get_table()[index]]
+
+
+def classify_codes(features):
+    # Batch version of lookup(): one gather from the table for every in-domain row
+    columns = _feature_columns(features)
+    index = np.zeros(len(columns[0]), dtype=np.int64)
+    known = np.ones(len(columns[0]), dtype=bool)
+    for name, column, stride in zip(FEATURES, columns, STRIDES):
+        # None, NaN or numbers in object columns break searchsorted's comparisons; as text they simply
+        # match no code and go through the cascade with the other unknown rows
+        column = np.asarray(column).astype(str)
+        alphabet = np.array(CODES[name], dtype=str)
+        digit = np.searchsorted(alphabet, column).clip(0, len(alphabet) - 1)
+        known &= alphabet[digit] == column
+        index += digit * stride
+
+    verdicts = VERDICTS[get_table()[np.where(known, index, 0)]]
+    if not known.all():
+        verdicts[~known] = classify_batch(np.column_stack(columns)[~known])
+    return verdicts
+
+
+if __name__ == "__main__":
+    table = save_table()
+    print(f"Wrote {TABLE_PATH} ({table.nbytes:,} bytes, {int(table.sum()):,} edible of {DOMAIN_SIZE:,} combinations)")
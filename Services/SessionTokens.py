@@ -0,0 +1,98 @@
+# Stateless, HMAC-signed session tokens for Main.py.
+# A token is base64url("username:expiry") + "." + base64url(HMAC-SHA256 of that payload), so any
+# replica holding the same key can validate it without touching users.db. Verified tokens are
+# remembered in a bounded LRU, making repeat checks on every rerun a dictionary lookup plus an
+# expiry comparison. Set MUSHROOM_SESSION_KEY on every replica; without it each process signs with
+# a random key and sessions end when the process restarts.
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+TOKEN_TTL_SECONDS = 12 * 60 * 60
+CACHE_SIZE = 4096
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class SessionSigner:
+    def __init__(self, key, ttl=TOKEN_TTL_SECONDS, cache_size=CACHE_SIZE):
+        self.key = key.encode() if isinstance(key, str) else key
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # token -> (username, expiry)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _signature(self, payload):
+        return hmac.new(self.key, payload, hashlib.sha256).digest()
+
+    def issue(self, username, now=None):
+        expiry = int((now or time.time()) + self.ttl)
+        payload = f"{username}:{expiry}".encode()
+        return f"{_b64encode(payload)}.{_b64encode(self._signature(payload))}"
+
+    def verify(self, token, now=None):
+        # Username the token was issued to, or None if it is malformed, forged or expired
+        if not token:
+            return None
+        now = now or time.time()
+        with self.lock:
+            cached = self.cache.get(token)
+            if cached is not None:
+                self.cache.move_to_end(token)
+                self.hits += 1
+        if cached is not None:
+            username, expiry = cached
+            return username if now < expiry else None
+
+        with self.lock:
+            self.misses += 1
+        try:
+            encoded_payload, encoded_signature = token.split(".")
+            payload = _b64decode(encoded_payload)
+            signature = _b64decode(encoded_signature)
+            username, expiry = payload.decode().rsplit(":", 1)
+            expiry = int(expiry)
+        except (ValueError, UnicodeDecodeError):
+            return None
+        if not hmac.compare_digest(signature, self._signature(payload)) or now >= expiry:
+            return None
+        with self.lock:
+            self.cache[token] = (username, expiry)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return username
+
+    def stats(self):
+        with self.lock:
+            return {"cached": len(self.cache), "hits": self.hits, "misses": self.misses}
+
+
+_signer = None
+_signer_lock = threading.Lock()
+
+
+def get_signer():
+    global _signer
+    with _signer_lock:
+        if _signer is None:
+            key = os.environ.get("MUSHROOM_SESSION_KEY") or secrets.token_bytes(32)
+            _signer = SessionSigner(key, int(os.environ.get("MUSHROOM_SESSION_TTL", TOKEN_TTL_SECONDS)))
+    return _signer
+
+
+def get_signer_if_created():
+    # None until something has called get_signer(); never creates one (used by Telemetry's gauges)
+    return _signer
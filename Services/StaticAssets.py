@@ -0,0 +1,104 @@
+# Self-hosted page backgrounds.
+# Each page used to point its CSS at a different full-size JPEG on a remote image host. The
+# backgrounds are now built from the photos in images/: scaled to BACKGROUND_WIDTH, recompressed,
+# and written to static/backgrounds/ under fingerprinted names (<page>.<content hash>.jpg) that are
+# listed in manifest.json. Streamlit serves static/ at app/static/ once server.enableStaticServing
+# is on (.streamlit/config.toml), so the app needs no outside network access. A changed image gets a
+# new name, which lets a proxy in front of the app cache /app/static/ with far-future headers.
+# The built files are committed; rebuild them after changing BACKGROUNDS with:
+#   python -m Services.StaticAssets
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from Services.ImageCache import IMAGES_DIR, render
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+BACKGROUND_DIR = STATIC_DIR / "backgrounds"
+MANIFEST = BACKGROUND_DIR / "manifest.json"
+STATIC_URL = "app/static"
+
+BACKGROUND_WIDTH = 1600
+BACKGROUND_QUALITY = 70
+
+# Page -> source photo in images/
+BACKGROUNDS = {
+    "login": "parasol-4549617_1280.jpg",
+    "home": "mushroom1.jpg",
+    "edibility_checker": "mushroom3.jpg",
+    "ml_lab": "mushroom4.jpg",
+    "wisdom": "mushroom6.jpg",
+    "gallery": "mushroom8.jpg",
+}
+
+BACKGROUND_CSS = """
+<style>
+    .stApp {{
+        background: url("{url}");
+        background-size: {size};
+        background-position: center;
+        min-height: 100vh; /* Minimum height to cover the full viewport */
+        height: auto; /* Adjust height based on content */
+    }}
+</style>
+"""
+
+_manifest = None
+_css = {}
+_lock = threading.Lock()
+
+
+def build(out_dir=BACKGROUND_DIR):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for page, source in BACKGROUNDS.items():
+        data = render(IMAGES_DIR / source, BACKGROUND_WIDTH, BACKGROUND_QUALITY)
+        name = f"{page}.{hashlib.blake2b(data, digest_size=6).hexdigest()}.jpg"
+        for stale in out_dir.glob(f"{page}.*.jpg"):
+            if stale.name != name:
+                stale.unlink()
+        (out_dir / name).write_bytes(data)
+        manifest[page] = name
+    (out_dir / MANIFEST.name).write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+def manifest():
+    global _manifest
+    if _manifest is None:
+        with _lock:
+            if _manifest is None:
+                _manifest = json.loads(MANIFEST.read_text())
+    return _manifest
+
+
+def background_url(page):
+    names = manifest()
+    if page not in names:
+        raise KeyError(f"No background for '{page}'. Available: {', '.join(names)}")
+    return f"{STATIC_URL}/backgrounds/{names[page]}"
+
+
+def background_css(page, size="100% 100%"):
+    # The same string on every rerun, so the frontend keeps the existing element instead of
+    # re-creating it and the browser never re-requests the image
+    key = (page, size)
+    if key not in _css:
+        _css[key] = BACKGROUND_CSS.format(url=background_url(page), size=size)
+    return _css[key]
+
+
+def set_background(page, size="100% 100%"):
+    import streamlit as st
+    st.markdown(background_css(page, size), unsafe_allow_html=True)
+
+
+if __name__ == "__main__":
+    built = build()
+    print(f"{'page':<20}{'source':<30}{'original':>12}{'background':>12}  file")
+    for page, name in built.items():
+        source = IMAGES_DIR / BACKGROUNDS[page]
+        print(f"{page:<20}{source.name:<30}{source.stat().st_size:>12,}"
+              f"{(BACKGROUND_DIR / name).stat().st_size:>12,}  {name}")
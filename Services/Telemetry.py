@@ -0,0 +1,257 @@
+# Process-wide stage timings and counters.
+# span("fit") times a block into a fixed-bucket latency histogram, and count("logins", outcome="ok")
+# bumps a counter. Both cost one perf_counter pair and a short lock, so they can sit on every rerun.
+# Keep label values low-cardinality (stage and page names, outcomes), never usernames or file names.
+# The snapshot renders as Prometheus text (render_prometheus). It is served on /metrics when
+# MUSHROOM_METRICS_PORT is set (on 127.0.0.1 unless MUSHROOM_METRICS_ADDRESS is given), and shown
+# in Main.py's sidebar to the users listed in MUSHROOM_ADMINS.
+# Stats of the other process-wide services (hasher, rate limits, stores, caches) are exported as
+# gauges, but only for the ones this process has already created.
+#
+#   with span("predict", model="SVC"):
+#       model.predict(x)
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "mushroom"
+# Upper bounds in seconds, from a cached rerun up to a large model fit
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+COUNTER_HELP = {
+    "reruns": "Script reruns",
+    "logins": "Login attempts by outcome",
+    "signups": "Signup attempts by outcome",
+    "classifications": "Classify clicks that produced a result, by page",
+    "rows_scored": "Rows scored by ML Lab models",
+}
+
+# Component -> (module, accessor returning its singleton or None, or None for a module-level stats())
+COMPONENTS = {
+    "password_hasher": ("Services.PasswordHasher", "get_hasher_if_created"),
+    "rate_limit": ("Services.RateLimit", None),
+    "user_store": ("Services.UserStore", "get_store_if_created"),
+    "session_tokens": ("Services.SessionTokens", "get_signer_if_created"),
+    "model_cache": ("Services.ModelCache", "get_cache_if_created"),
+    "chart_cache": ("Services.ChartCache", "get_cache_if_created"),
+    "image_cache": ("Services.ImageCache", "get_cache_if_created"),
+}
+
+
+def _labels(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q):
+        # Linear interpolation inside the bucket holding the q-th observation, as histogram_quantile does
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, in_bucket in enumerate(self.counts):
+            if in_bucket and seen + in_bucket >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / in_bucket
+            seen += in_bucket
+        return self.buckets[-1]
+
+
+class Telemetry:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.histograms = {}  # labels -> Histogram of stage durations
+        self.counters = {}  # (name, labels) -> value
+        self.started = time.time()
+
+    def observe(self, stage, seconds, **labels):
+        key = _labels({"stage": stage, **labels})
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def span(self, stage, **labels):
+        # Failed stages are timed too, under error="true", so a slow failure still shows up. Streamlit's
+        # rerun/stop signals are BaseExceptions; a stage cut short by one is not recorded at all.
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.observe(stage, time.perf_counter() - start, error="true", **labels)
+            raise
+        self.observe(stage, time.perf_counter() - start, **labels)
+
+    def count(self, name, value=1, **labels):
+        key = (name, _labels(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def stages(self):
+        # [{stage, labels, count, total_seconds, p50, p95, p99}] for the admin panel
+        with self.lock:
+            snapshot = [(dict(key), histogram.count, histogram.sum,
+                         [histogram.quantile(q) for q in (0.5, 0.95, 0.99)])
+                        for key, histogram in self.histograms.items()]
+        rows = []
+        for labels, count, total, (p50, p95, p99) in sorted(snapshot, key=lambda row: -row[2]):
+            stage = labels.pop("stage")
+            rows.append({"stage": stage, "labels": ", ".join(f"{k}={v}" for k, v in labels.items()),
+                         "count": count, "total_seconds": total, "p50": p50, "p95": p95, "p99": p99})
+        return rows
+
+    def counter_values(self):
+        with self.lock:
+            return {(name, labels): value for (name, labels), value in sorted(self.counters.items())}
+
+    def render_prometheus(self):
+        lines = []
+        with self.lock:
+            histograms = sorted((key, list(h.counts), h.count, h.sum) for key, h in self.histograms.items())
+            counters = sorted(self.counters.items())
+
+        name = f"{PREFIX}_stage_seconds"
+        lines += [f"# HELP {name} Time spent per app stage", f"# TYPE {name} histogram"]
+        for labels, counts, count, total in histograms:
+            cumulative = 0
+            for bound, in_bucket in zip(self.buckets + (float("inf"),), counts):
+                cumulative += in_bucket
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        by_name = {}
+        for (counter, labels), value in counters:
+            by_name.setdefault(counter, []).append((labels, value))
+        for counter, series in by_name.items():
+            name = f"{PREFIX}_{counter}_total"
+            lines += [f"# HELP {name} {COUNTER_HELP.get(counter, counter)}", f"# TYPE {name} counter"]
+            lines += [f"{name}{_format_labels(labels)} {value}" for labels, value in series]
+
+        for component, stats in component_stats().items():
+            for key, value in _flatten(stats):
+                name = f"{PREFIX}_{component}_{key}"
+                lines += [f"# TYPE {name} gauge", f"{name} {float(value)}"]
+
+        lines += [f"# TYPE {PREFIX}_process_start_time_seconds gauge",
+                  f"{PREFIX}_process_start_time_seconds {self.started}"]
+        return "\n".join(lines) + "\n"
+
+
+def _flatten(stats, prefix=""):
+    # Numeric leaves of a (possibly nested) stats dict; strings such as RateLimiter.scope are skipped
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{key}_")
+        elif isinstance(value, (bool, int, float)):
+            yield f"{prefix}{key}", value
+
+
+def component_stats():
+    # Only services this process has already imported and created; exporting never creates one
+    stats = {}
+    for component, (module_name, accessor) in COMPONENTS.items():
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        source = module if accessor is None else getattr(module, accessor)()
+        if source is not None:
+            stats[component] = source.stats()
+    return stats
+
+
+_telemetry = Telemetry()
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_telemetry():
+    return _telemetry
+
+
+def span(stage, **labels):
+    return _telemetry.span(stage, **labels)
+
+
+def count(name, value=1, **labels):
+    _telemetry.count(name, value, **labels)
+
+
+def render_prometheus():
+    return _telemetry.render_prometheus()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port=None, address=None):
+    # Serves /metrics from a daemon thread, once per process; MUSHROOM_METRICS_PORT turns it on.
+    # Loopback only unless MUSHROOM_METRICS_ADDRESS says otherwise (e.g. 0.0.0.0 for a remote scraper).
+    global _server
+    port = port or int(os.environ.get("MUSHROOM_METRICS_PORT", 0))
+    if not port:
+        return None
+    address = address or os.environ.get("MUSHROOM_METRICS_ADDRESS", "127.0.0.1")
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((address, port), _MetricsHandler)
+            except OSError as exc:
+                # Not worth failing page loads over; warn once and leave the endpoint off
+                logging.getLogger(__name__).warning("Metrics endpoint not started on port %s: %s", port, exc)
+                _server = False
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server or None
+
+
+def admins():
+    return {name.strip() for name in os.environ.get("MUSHROOM_ADMINS", "").split(",") if name.strip()}
+
+
+if __name__ == "__main__":
+    print(render_prometheus(), end="")
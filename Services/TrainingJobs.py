@@ -0,0 +1,141 @@
+# Background training for the ML Lab.
+# model.fit runs in a process pool so the Streamlit script thread never blocks. Workers report
+# progress through a Manager dict (trees built for forests, stages for everything else) and check
+# a cancel flag between steps. The pool is shared by the whole process; each session keeps track
+# of its own job ids.
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+FOREST_STEPS = 20
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def _report(progress, job_id, done, total, message):
+    progress[job_id] = (done, total, message)
+
+
+def _train(job_id, estimator, params, x_train, y_train, progress, cancelled):
+    # Runs in a worker process. Up to max_workers jobs run at once, so each fit keeps to a single core;
+    # the requested n_jobs is put back on the returned model for prediction in the app.
+    if "n_jobs" in estimator().get_params():
+        model = _fit(job_id, estimator, {**params, "n_jobs": 1}, x_train, y_train, progress, cancelled)
+        return model.set_params(n_jobs=params.get("n_jobs"))
+    return _fit(job_id, estimator, params, x_train, y_train, progress, cancelled)
+
+
+def _fit(job_id, estimator, params, x_train, y_train, progress, cancelled):
+    if params.get("n_estimators") and "warm_start" in estimator().get_params():
+        # Grow the ensemble in steps with warm_start so progress (and cancellation) is per batch of trees
+        total = params["n_estimators"]
+        step = max(1, total // FOREST_STEPS)
+        model = estimator(**{**params, "n_estimators": 0, "warm_start": True})
+        built = 0
+        while built < total:
+            if cancelled.get(job_id):
+                raise JobCancelled(job_id)
+            built = min(total, built + step)
+            model.set_params(n_estimators=built)
+            model.fit(x_train, y_train)
+            _report(progress, job_id, built, total, f"{built}/{total} trees built")
+        if cancelled.get(job_id):
+            raise JobCancelled(job_id)
+        return model.set_params(warm_start=False)
+
+    _report(progress, job_id, 0, 1, "fitting")
+    if cancelled.get(job_id):
+        raise JobCancelled(job_id)
+    model = estimator(**params).fit(x_train, y_train)
+    # A single fit() cannot be interrupted; a cancel that arrived meanwhile discards its result
+    if cancelled.get(job_id):
+        raise JobCancelled(job_id)
+    _report(progress, job_id, 1, 1, "fitted")
+    return model
+
+
+class Job:
+    def __init__(self, job_id, label, key, future):
+        self.id = job_id
+        self.label = label
+        self.key = key
+        self.future = future
+        self.submitted = time.time()
+        self.finished = None
+
+
+class JobRunner:
+    def __init__(self, max_workers=None):
+        # spawn, not fork: forking a multi-threaded Streamlit server is unsafe
+        context = multiprocessing.get_context("spawn")
+        self.manager = context.Manager()
+        self.progress = self.manager.dict()
+        self.cancelled = self.manager.dict()
+        self.pool = ProcessPoolExecutor(max_workers=max_workers or max(1, (os.cpu_count() or 2) - 1),
+                                        mp_context=context)
+        self.jobs = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def submit(self, label, key, estimator, params, x_train, y_train):
+        with self.lock:
+            job_id = next(self.ids)
+        _report(self.progress, job_id, 0, 1, "queued")
+        future = self.pool.submit(_train, job_id, estimator, params, x_train, y_train, self.progress, self.cancelled)
+        job = Job(job_id, label, key, future)
+        future.add_done_callback(lambda _: setattr(job, "finished", time.time()))
+        with self.lock:
+            self.jobs[job_id] = job
+        return job_id
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is not None and not job.future.cancel():
+            self.cancelled[job_id] = True  # already running: stop at the next step
+
+    def status(self, job_id):
+        job = self.jobs[job_id]
+        done, total, message = self.progress.get(job_id, (0, 1, "queued"))
+        if job.future.cancelled():
+            state = "cancelled"
+        elif job.future.done():
+            exc = job.future.exception()
+            state = "cancelled" if isinstance(exc, JobCancelled) else "failed" if exc else "done"
+            if exc and not isinstance(exc, JobCancelled):
+                message = str(exc)
+        elif job.future.running():
+            state = "running"
+            if self.cancelled.get(job_id):
+                message = "cancelling after the current step"
+        else:
+            state = "queued"
+        elapsed = (job.finished or time.time()) - job.submitted
+        return {"id": job_id, "label": job.label, "state": state, "done": done, "total": total,
+                "message": message, "elapsed": elapsed}
+
+    def collect(self, job_id):
+        # Hand back the fitted model of a finished job and forget the job
+        job = self.jobs.pop(job_id)
+        self.progress.pop(job_id, None)
+        self.cancelled.pop(job_id, None)
+        if job.future.cancelled() or job.future.exception() is not None:
+            return job.key, None
+        return job.key, job.future.result()
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner():
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner(int(os.environ.get("MUSHROOM_TRAINING_WORKERS", 0)) or None)
+    return _runner
@@ -0,0 +1,167 @@
+# SQLite-backed user store for Main.py's login and signup forms.
+# A per-process pool of long-lived connections replaces one sqlite3.connect() per call. Each
+# connection runs in WAL mode (readers never block on the writer) with a busy timeout, and the SQL
+# text is constant so sqlite3's per-connection statement cache reuses the prepared statements.
+# Signups take the write lock up front (BEGIN IMMEDIATE), so a busy database surfaces as a bounded
+# wait instead of a failed upgrade from a read lock.
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from Services.PasswordHasher import HASH_METHOD, get_hasher
+
+DB_PATH = Path(__file__).resolve().parent.parent / "users.db"
+POOL_SIZE = 8
+BUSY_TIMEOUT_MS = 5000
+
+CREATE_USERS = """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL
+    )
+"""
+INSERT_USER = "INSERT INTO users (username, password) VALUES (?, ?)"
+SELECT_PASSWORD = "SELECT password FROM users WHERE username = ?"
+
+
+class ConnectionPool:
+    def __init__(self, path, size=POOL_SIZE, busy_timeout_ms=BUSY_TIMEOUT_MS):
+        self.path = str(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.idle = queue.LifoQueue(maxsize=size)
+        self.created = 0
+        self.size = size
+        self.lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _connect(self):
+        # isolation_level=None: transactions are opened explicitly, so reads never hold one
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None,
+                               check_same_thread=False, cached_statements=64)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                grow = self.created < self.size
+                if grow:
+                    self.created += 1
+            if grow:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    # Give the slot back, or a few failed connects would leave every caller waiting
+                    # on connections that were never made
+                    with self.lock:
+                        self.created -= 1
+                    raise
+            else:
+                # Every connection is checked out: wait for one to come back
+                start = time.perf_counter()
+                conn = self.idle.get()
+                with self.lock:
+                    self.waits += 1
+                    self.wait_seconds += time.perf_counter() - start
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self.idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class UserStore:
+    def __init__(self, path=DB_PATH, pool_size=POOL_SIZE, hash_method=HASH_METHOD, hasher=None):
+        self.pool = ConnectionPool(path, pool_size)
+        self.hash_method = hash_method
+        # Hashing runs on the shared bounded pool and may raise HasherBusy under load
+        self.hasher = hasher or get_hasher()
+        self.stats_lock = threading.Lock()
+        self.counts = {"signups": 0, "duplicates": 0, "logins": 0, "failed_logins": 0}
+        self.db_seconds = 0.0
+        with self.pool.connection() as conn:
+            conn.execute(CREATE_USERS)
+
+    def _count(self, name, seconds):
+        with self.stats_lock:
+            self.counts[name] += 1
+            self.db_seconds += seconds
+
+    def add_user(self, username, password):
+        hashed_password = self.hasher.hash(password, self.hash_method)
+        start = time.perf_counter()
+        with self.pool.connection() as conn:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(INSERT_USER, (username, hashed_password))
+                conn.execute("COMMIT")
+            except sqlite3.IntegrityError:
+                conn.execute("ROLLBACK")
+                self._count("duplicates", time.perf_counter() - start)
+                return False
+        self._count("signups", time.perf_counter() - start)
+        return True
+
+    def password_hash(self, username):
+        with self.pool.connection() as conn:
+            row = conn.execute(SELECT_PASSWORD, (username,)).fetchone()
+        return row[0] if row else None
+
+    def authenticate(self, username, password):
+        start = time.perf_counter()
+        hashed_password = self.password_hash(username)
+        seconds = time.perf_counter() - start
+        if hashed_password and self.hasher.verify(hashed_password, password):
+            self._count("logins", seconds)
+            return True
+        self._count("failed_logins", seconds)
+        return False
+
+    def stats(self):
+        with self.stats_lock, self.pool.lock:
+            return {**self.counts, "db_seconds": self.db_seconds, "connections": self.pool.created,
+                    "pool_waits": self.pool.waits, "pool_wait_seconds": self.pool.wait_seconds}
+
+    def close(self):
+        self.pool.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    # One store per process, shared by every Streamlit session; MUSHROOM_USERS_DB overrides the path
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = UserStore(os.environ.get("MUSHROOM_USERS_DB", DB_PATH))
+    return _store
+
+
+def get_store_if_created():
+    # None until something has called get_store(); never creates one (used by Telemetry's gauges)
+    return _store
@@ -1,13 +1,15 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-import joblib
+from Services.LazyImport import lazy_import
+from Services.StaticAssets import set_background
+from Services.Telemetry import count, span
 
-def classification():
+# The model and rule services (and pandas/numpy under them) load on the first Classify click, not on import
+ModelRegistry = lazy_import("Services.ModelRegistry")
+RuleTable = lazy_import("Services.RuleTable")
+
+def classification(specimens):
     
-    model = joblib.load("models/logistic_regression_model.pkl")  # Update path if necessary
+    model = ModelRegistry.get("logistic_regression")  # Loaded once per process from Models/
     
     # Full name dictionaries for feature mapping (as provided earlier)
     cap_shape_full_names = {"b": "Bell", "c": "Conical", "f": "Flat", "k": "Knobbed", "s": "Sunken", "x": "Convex"}
@@ -31,31 +33,10 @@ def classification():
     population_full_names = {"a": "Abundant", "c": "Clustered", "n": "Numerous", "s": "Scattered", "v": "Several", "y": "Solitary"}
     habitat_full_names = {"g": "Grasses", "l": "Leaves", "m": "Meadows", "p": "Paths", "u": "Urban", "w": "Waste", "d": "Woods"}
 
-    # Define the PCA transformation function
-    def apply_pca(df):
-        # Columns to be encoded and transformed
-        cap_columns = ['cap-shape', 'cap-surface', 'cap-color']
-        gill_columns = ['gill-attachment', 'gill-spacing', 'gill-size', 'gill-color']
-        stalk_columns = ['stalk-shape', 'stalk-root', 'stalk-surface-above-ring', 'stalk-surface-below-ring', 'stalk-color-above-ring', 'stalk-color-below-ring']
-
-        # Encode categorical features using factorize
-        for col in [cap_columns, gill_columns, stalk_columns]:
-            for feature in col:
-                df[feature] = pd.factorize(df[feature])[0]
-        
-        # Scale the features before applying PCA
-        scaler = StandardScaler()
-        df[cap_columns + gill_columns + stalk_columns] = scaler.fit_transform(df[cap_columns + gill_columns + stalk_columns])
-        
-        # Apply PCA transformation to the features
-        pca = PCA(n_components=1)
-        df['cap'] = pca.fit_transform(df[cap_columns])
-        df['gill'] = pca.fit_transform(df[gill_columns])
-        df['stalk'] = pca.fit_transform(df[stalk_columns])
-
-        # Drop the original columns after PCA
-        df = df.drop(columns=cap_columns + gill_columns + stalk_columns)
-        return df
+    # Pre-fitted encoders -> scaler -> cap/gill/stalk PCA, shared by every call (transform only)
+    pipeline = ModelRegistry.get("feature_pipeline")
+    features = pipeline.transform(specimens)
+    return model.predict_proba(features.to_numpy())
 
 st.markdown(
     """
@@ -93,43 +74,10 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-def classify_mushroom(odor, bruises, gill_color, cap_shape, cap_surface, cap_color):
-    match (odor, bruises, gill_color, cap_shape, cap_surface, cap_color):
-        case ("f" | "y" | "c" | "m" | "p" | "s", _, _, _, _, _):
-            return "Poisonous"
-        case ("n", "t", _, _, _, "w" | "g" | "n"):
-            return "Edible"
-        case ("n", _, "b" | "p" | "u", _, _, _):
-            return "Edible"
-        case ("a", _, "b" | "p" | "u", _, _, _):
-            return "Edible"
-        case ("n", _, _, "x" | "f", "s", _):
-            return "Edible"
-        case (_, "f", _, "b" | "c", "y" | "f", _):
-            return "Poisonous"
-        case _:
-            return "Poisonous"
-
 # Streamlit app
 def app():
 
-    def set_bg_hack_url():
-        st.markdown(
-            f"""
-            <style>
-                .stApp {{
-                    background: url("https://avi-chavan-96.sirv.com/Mushroom/mushroom-7235034_1280.jpg");
-                    background-size: 100% 100%;
-                    background-position: center;
-                    min-height: 100vh; /* Minimum height to cover the full viewport */
-                    height: auto; /* Adjust height based on content */
-                }}
-            </style>
-            """,
-            unsafe_allow_html=True
-        )
-
-    set_bg_hack_url()
+    set_background("edibility_checker")
 
 
     st.title("🍄 Edibility Checker")
@@ -167,7 +115,9 @@ def app():
 
     # Classify on button click
     if st.button("🍄 Classify Mushroom"):
-        classification = classify_mushroom(odor_code, bruises_code, gill_color_code, cap_shape_code, cap_surface_code, cap_color_code)
+        with span("classify", page="edibility_checker"):
+            classification = RuleTable.lookup(odor_code, bruises_code, gill_color_code, cap_shape_code, cap_surface_code, cap_color_code)
+        count("classifications", page="edibility_checker")
         if classification == "Edible":
             st.success(f"✅ The Mushroom is **{classification}**! 🍄")
         else:
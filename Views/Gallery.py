@@ -1,6 +1,10 @@
 import streamlit as st
 import base64
 
+from Services.ImageCache import IMAGES_DIR, get_cache
+from Services.StaticAssets import set_background
+from Services.Telemetry import span
+
 def app():
     st.title("🍄 About Us")
     st.write(
@@ -10,22 +14,7 @@ def app():
         """
     )
     # About Us Page Header
-    def set_bg_hack_url():
-
-        st.markdown(
-            f"""
-            <style>
-            .stApp {{
-                background: url("https://avi-chavan-96.sirv.com/Mushroom/mushroom-7570693_1280.jpg");
-                background-size: 100% 100%;
-                background-position: center;
-                min-height: 100vh; /* Minimum height to cover the full viewport */
-                height: auto; /* Adjust height based on content */
-            }}
-            </style>
-            """,
-            unsafe_allow_html=True)
-    set_bg_hack_url()
+    set_background("gallery")
 
     # About Us Page Header
     st.title("🍄 About Us")
@@ -186,13 +175,13 @@ def app():
             "name": "Alice Smith",
             "role": "Project Lead and Data Scientist",
             "bio": "Alice specializes in data-driven solutions and model optimization. She ensures the project's success with her leadership and expertise in AI.",
-            "image": "D:\Mushroom Project\images\mushroom2.jpg"
+            "image": IMAGES_DIR / "mushroom2.jpg"
         },
         {
             "name": "Bob Johnson",
             "role": "Machine Learning Engineer",
             "bio": "Bob focuses on building robust and efficient machine learning models, ensuring high accuracy and reliability in predictions.",
-            "image": "D:\Mushroom Project\images\mushroom2.jpg"
+            "image": IMAGES_DIR / "mushroom2.jpg"
         }
     ]
     # Create team member profiles
@@ -201,25 +190,25 @@ def app():
             "name": "Chavan Avinash",
             "role": "Project Lead and Data Scientist",
             "bio": "Alice specializes in data-driven solutions and model optimization. She ensures the project's success with her leadership and expertise in AI.",
-            "image": "D:\Mushroom Project\images\mushroom2.jpg"
+            "image": IMAGES_DIR / "mushroom2.jpg"
         },
         {
             "name": "Pratiksha Irole",
             "role": "Machine Learning Engineer",
             "bio": "Bob focuses on building robust and efficient machine learning models, ensuring high accuracy and reliability in predictions.",
-            "image": "D:\Mushroom Project\images\mushroom2.jpg"
+            "image": IMAGES_DIR / "mushroom2.jpg"
         },
         {
             "name": "Sneha Shinde",
             "role": "Frontend Developer and UI Designer",
             "bio": "Carla designs user-friendly interfaces that make the app accessible to everyone. Her creativity brings the project to life.",
-            "image": "D:\Mushroom Project\images\mushroom2.jpg"
+            "image": IMAGES_DIR / "mushroom2.jpg"
         },
         {
             "name": "Samarth Garde",
             "role": "Researcher and Mushroom Expert",
             "bio": "David brings extensive knowledge of mycology and ensures the accuracy of mushroom classifications through his research.",
-            "image": "D:\Mushroom Project\images\mushroom2.jpg"
+            "image": IMAGES_DIR / "mushroom2.jpg"
         }
     ]
 
@@ -227,7 +216,9 @@ def app():
     cols = st.columns(len(head_members))
     for col, member in zip(cols, head_members):
         with col:
-            st.image(member["image"], use_container_width=True, caption=member["name"])
+            with span("thumbnail", page="gallery"):
+                thumbnail = get_cache().for_columns(member["image"], len(cols))
+            st.image(thumbnail, use_container_width=True, caption=member["name"])
             st.subheader(member["name"])
             st.write(f"**{member['role']}**")
             st.write(member["bio"])
@@ -242,7 +233,9 @@ def app():
     cols = st.columns(len(team_members))
     for col, member in zip(cols, team_members):
         with col:
-            st.image(member["image"], use_container_width=True, caption=member["name"])
+            with span("thumbnail", page="gallery"):
+                thumbnail = get_cache().for_columns(member["image"], len(cols))
+            st.image(thumbnail, use_container_width=True, caption=member["name"])
             st.subheader(member["name"])
             st.write(f"**{member['role']}**")
             st.write(member["bio"])
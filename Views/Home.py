@@ -1,29 +1,19 @@
 import streamlit as st
 import base64
-import pandas as pd
-import plotly.express as px
+from Services.LazyImport import lazy_import
+from Services.StaticAssets import set_background
+from Services.Telemetry import span
+
+# Only the distribution chart needs these
+pd = lazy_import("pandas")
+px = lazy_import("plotly.express")
 
 
 def app():
 
     # # Load images and set the background dynamically
     
-    def set_bg_hack_url():
-
-        st.markdown(
-            f"""
-            <style>
-            .stApp {{
-                background: url("https://avi-chavan-96.sirv.com/Mushroom/mushroom1.jpg");
-                background-size: 100% 100%;
-                background-position: center;
-                min-height: 100vh; /* Minimum height to cover the full viewport */
-                height: auto; /* Adjust height based on content */
-            }}
-            </style>
-            """,
-            unsafe_allow_html=True)
-    set_bg_hack_url()
+    set_background("home")
 
     # Header Section
     st.title(" Mushroom Trio Classifier 🍄")
@@ -46,7 +36,8 @@ def app():
     df = pd.DataFrame(data)
 
     # Create a bar chart
-    fig = px.bar(df, x="Mushroom Type", y="Frequency", title="Mushroom Type Distribution", color="Mushroom Type")
+    with span("plot", page="home"):
+        fig = px.bar(df, x="Mushroom Type", y="Frequency", title="Mushroom Type Distribution", color="Mushroom Type")
     st.plotly_chart(fig, use_container_width=True)
 
     # Mushroom Classification Overview
@@ -1,156 +1,307 @@
+import time
 import streamlit as st
-import pandas as pd
-import numpy as np
-from sklearn.svm import SVC
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.naive_bayes import GaussianNB
-from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import confusion_matrix, roc_curve, auc, precision_recall_curve, precision_score, recall_score, f1_score, accuracy_score
-import matplotlib.pyplot as plt
-import seaborn as sns
+from Services.LazyImport import lazy_import
+from Services.TrainingJobs import FINISHED_STATES, get_runner
+from Services.StaticAssets import set_background
+from Services.Telemetry import count, span
+
+# Heavy libraries and the services built on them load on first use, not when the page is imported
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+svm = lazy_import("sklearn.svm")
+linear_model = lazy_import("sklearn.linear_model")
+ensemble = lazy_import("sklearn.ensemble")
+tree = lazy_import("sklearn.tree")
+model_selection = lazy_import("sklearn.model_selection")
+ChartCache = lazy_import("Services.ChartCache")
+ChunkedIngest = lazy_import("Services.ChunkedIngest")
+Evaluation = lazy_import("Services.Evaluation")
+FastSvm = lazy_import("Services.FastSvm")
+HyperparameterSweep = lazy_import("Services.HyperparameterSweep")
+LowLatencyModels = lazy_import("Services.LowLatencyModels")
+ModelCache = lazy_import("Services.ModelCache")
+ResultsPager = lazy_import("Services.ResultsPager")
 
 def app():
     
-    def set_bg_hack_url():
-
-        st.markdown(
-            f"""
-            <style>
-            .stApp {{
-                background: url("https://avi-chavan-96.sirv.com/Mushroom/fly-agaric-7515053_1280.jpg");
-                background-size: 100% 100%;
-                background-position: center;
-                min-height: 100vh; /* Minimum height to cover the full viewport */
-                height: auto; /* Adjust height based on content */
-            }}
-            </style>
-            """,
-            unsafe_allow_html=True)
-    set_bg_hack_url()
+    set_background("ml_lab")
 
     st.title("🍄The Mushroom ML Lab: LR,RF,SVM🌳")
     st.markdown("Are your mushrooms edible or poisonous? 🍄")
     st.sidebar.title("Mushroom Classifiers")
     st.sidebar.markdown("Upload a Mushroom Dataset and classify whether it's edible or poisonous!")
 
+    # Both caches are keyed by the upload's digest; the leading underscore tells Streamlit
+    # not to hash the DataFrame argument itself on every rerun
     @st.cache_data(persist=True)
-    def preprocess_data(data):
-        label = LabelEncoder()
-        for col in data.columns:
-            data[col] = label.fit_transform(data[col])
-        return data
+    def read_sample(data_fingerprint, _source, chunk_rows):
+        return ChunkedIngest.read_training_sample(_source, chunk_rows, chunk_rows)
 
     @st.cache_data(persist=True)
-    def split(df, target_column):
-        y = df[target_column]
-        x = df.drop(columns=[target_column])
-        x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.3, random_state=0)
+    def preprocess_data(data_fingerprint, _data, _vocabularies=None):
+        from Services.CategoricalCodec import CategoricalCodec
+        if _vocabularies is not None:
+            codec = CategoricalCodec(_vocabularies)
+            return codec.transform(_data), codec
+        codec = CategoricalCodec()
+        return codec.fit_transform(_data), codec
+
+    def upload_fingerprint(uploaded_file):
+        # Hashing the upload once per file rather than on every rerun
+        known = st.session_state.get("upload_fingerprint")
+        if known is None or known[0] != uploaded_file.file_id:
+            known = (uploaded_file.file_id, ModelCache.fingerprint(uploaded_file.getvalue()))
+            st.session_state["upload_fingerprint"] = known
+        return known[1]
+
+    @st.cache_data(persist=True)
+    def split(data_fingerprint, target_column, _df):
+        y = _df[target_column]
+        x = _df.drop(columns=[target_column])
+        x_train, x_test, y_train, y_test = model_selection.train_test_split(x, y, test_size=0.3, random_state=0)
         return x_train, x_test, y_train, y_test
 
-    def plot_metrics(metrics_list, model, x_test, y_test, class_names):
-        # Confusion Matrix
-        if 'Confusion Matrix' in metrics_list:
-            st.subheader("Confusion Matrix")
-            cm = confusion_matrix(y_test, model.predict(x_test))
-            fig, ax = plt.subplots()
-            sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', xticklabels=class_names, yticklabels=class_names)
-            plt.ylabel('True label')
-            plt.xlabel('Predicted label')
-            st.pyplot(fig)
-
-        # ROC Curve
-        if 'ROC Curve' in metrics_list:
-            st.subheader("ROC Curve")
-            if hasattr(model, "predict_proba"):  # For models like Logistic Regression, RandomForest
-                probs = model.predict_proba(x_test)[:, 1]
-            else:  # For models like SVM that use decision_function
-                probs = model.decision_function(x_test)
-            fpr, tpr, _ = roc_curve(y_test, probs)
-            roc_auc = auc(fpr, tpr)
-            fig, ax = plt.subplots()
-            ax.plot(fpr, tpr, color='blue', lw=2, label=f'ROC curve (area = {roc_auc:.2f})')
-            ax.plot([0, 1], [0, 1], color='gray', linestyle='--')
-            ax.set_xlim([0.0, 1.0])
-            ax.set_ylim([0.0, 1.05])
-            ax.set_xlabel('False Positive Rate')
-            ax.set_ylabel('True Positive Rate')
-            ax.set_title('Receiver Operating Characteristic (ROC) Curve')
-            ax.legend(loc="lower right")
-            st.pyplot(fig)
-
-        # Precision-Recall Curve
-        if 'Precision-Recall Curve' in metrics_list:
-            st.subheader("Precision-Recall Curve")
-            precision, recall, _ = precision_recall_curve(y_test, model.predict_proba(x_test)[:, 1])
-            fig, ax = plt.subplots()
-            ax.plot(recall, precision, color='blue', lw=2)
-            ax.set_xlabel('Recall')
-            ax.set_ylabel('Precision')
-            ax.set_title('Precision-Recall Curve')
-            st.pyplot(fig)
-
-        # Recall vs Threshold Plot
-        if 'Recall vs Threshold' in metrics_list:
-            st.subheader("Recall vs Threshold")
-            precision, recall, thresholds = precision_recall_curve(y_test, model.predict_proba(x_test)[:, 1])
-            fig, ax = plt.subplots()
-            ax.plot(thresholds, recall[:-1], color='green', lw=2)
-            ax.set_xlabel('Threshold')
-            ax.set_ylabel('Recall')
-            ax.set_title('Recall vs Threshold')
-            st.pyplot(fig)
-
-        # F1-Score vs Threshold Plot
-        if 'F1-Score vs Threshold' in metrics_list:
-            st.subheader("F1-Score vs Threshold")
-            precision, recall, thresholds = precision_recall_curve(y_test, model.predict_proba(x_test)[:, 1])
-            f1_scores = 2 * (precision * recall) / (precision + recall)
-            fig, ax = plt.subplots()
-            ax.plot(thresholds, f1_scores[:-1], color='red', lw=2)
-            ax.set_xlabel('Threshold')
-            ax.set_ylabel('F1-Score')
-            ax.set_title('F1-Score vs Threshold')
-            st.pyplot(fig)
+    def plot_metrics(metrics_list, evaluation, class_names):
+        # Every chart reads from the same EvaluationBundle, so the model is evaluated on x_test at most once.
+        # Charts already drawn for this model and split come back as cached PNG bytes.
+        charts = ChartCache.get_cache()
+        for metric in ChartCache.METRICS:
+            if metric in metrics_list:
+                st.subheader(metric)
+                with span("plot", metric=metric):
+                    png = charts.chart(metric, evaluation, class_names)
+                st.image(png, width="stretch")
+
+    @st.fragment(run_every=1)
+    def training_jobs_panel():
+        # Polls this session's background jobs; finished models are moved into the model cache
+        jobs = st.session_state.get("training_jobs", {})
+        if not jobs:
+            return
+        runner = get_runner()
+        st.subheader("Background Training Jobs")
+        for job_id, last in list(jobs.items()):
+            status = last if last and last["state"] in FINISHED_STATES else runner.status(job_id)
+            if status["state"] in FINISHED_STATES and status is not last:
+                key, model = runner.collect(job_id)
+                if model is not None:
+                    ModelCache.get_cache().put(key, model)
+            jobs[job_id] = status
+
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.progress(status["done"] / max(status["total"], 1),
+                            text=f"{status['label']} · {status['state']} · {status['message']} · {status['elapsed']:.0f}s")
+            with col2:
+                if status["state"] not in FINISHED_STATES:
+                    if st.button("Cancel", key=f"cancel_job_{job_id}"):
+                        runner.cancel(job_id)
+                elif st.button("Dismiss", key=f"dismiss_job_{job_id}"):
+                    del jobs[job_id]
+                    st.rerun(scope="fragment")
+
+    @st.fragment
+    def results_table(pager):
+        # Paging, sorting and filtering rerun only this fragment; one page is sent to the browser
+        col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+        with col1:
+            shown = st.selectbox("Show", list(ResultsPager.FILTERS), key='results_filter')
+        with col2:
+            sort_by = st.selectbox("Sort by", ["(upload order)", *pager.columns], key='results_sort')
+        with col3:
+            ascending = st.radio("Order", ("Asc", "Desc"), key='results_order') == "Asc"
+        with col4:
+            page_size = st.selectbox("Rows per page", (25, 50, 100, 250), index=1, key='results_page_size')
+        rows = pager.query(ResultsPager.FILTERS[shown], None if sort_by == "(upload order)" else sort_by, ascending)
+        pages = ResultsPager.page_count(len(rows), page_size)
+        page_number = min(st.number_input("Page", 1, step=1, key='results_page'), pages)
+        st.dataframe(pager.page(rows, page_number - 1, page_size))
+        st.caption(f"Page {page_number:,} of {pages:,} · {len(rows):,} matching of {len(pager):,} rows")
 
     # File uploader
     uploaded_file = st.sidebar.file_uploader("Upload a Mushroom Dataset CSV", type=["csv"])
 
     if uploaded_file is not None:
-        data = pd.read_csv(uploaded_file)
-        possible_targets = ['type', 'class', 'class=e', 'class=p']
-        target_column = None
-        for col in possible_targets:
-            if col in data.columns:
-                target_column = col
-                break
-
-        if target_column is None:
+        streaming = st.sidebar.checkbox("Stream large file in chunks", False, help="Train on a random sample of the file, then score it chunk by chunk with a fixed memory ceiling")
+        # Trained models are reused across reruns as long as the upload and hyperparameters match
+        data_fingerprint = upload_fingerprint(uploaded_file)
+        vocabularies = None
+        if streaming:
+            chunk_rows = st.sidebar.number_input("Rows per chunk", 1000, 1_000_000, 100_000, step=1000, key='chunk_rows',
+                                                 help="Also the size of the training sample")
+            data_fingerprint += f"-sample{chunk_rows}"
+            with span("parse_csv", mode="sample"):
+                data, vocabularies = read_sample(data_fingerprint, uploaded_file, chunk_rows)
+        else:
+            with span("parse_csv", mode="full"):
+                data = pd.read_csv(uploaded_file)
+        model_cache = ModelCache.get_cache()
+        target_column, guessed = ChunkedIngest.infer_target(data.columns)
+
+        if guessed:
             # Automatically choose the last column as the target if no expected column is found
-            target_column = data.columns[-1]
             st.warning(f"Using '{target_column}' as the target column since no expected column was found.")
 
         
-        df = preprocess_data(data)
-        x_train, x_test, y_train, y_test = split(df, target_column)
+        with span("preprocess_data"):
+            df, codec = preprocess_data(data_fingerprint, data, vocabularies)
+        with span("split"):
+            x_train, x_test, y_train, y_test = split(data_fingerprint, target_column, df)
         class_names = ['edible', 'poisonous']
+        # Letter-coded uploads get Hamming-distance KNN and CategoricalNB
+        categorical = LowLatencyModels.is_categorical(data.drop(columns=[target_column]))
 
         # Toggle dataset visibility
         if st.sidebar.checkbox("Show Dataset", False):
             st.subheader("Mushroom Dataset (Processed for Classification)")
             st.write(data)
 
+        def train(estimator, params):
+            # Returns (model cache key, model). Cached models come back immediately. Otherwise fit here,
+            # or hand the fit to a background job and return no model so the page stays responsive.
+            key = ModelCache.model_key(data_fingerprint, estimator, params)
+            model = model_cache.get(key)
+            if model is not None:
+                return key, model
+            if not background:
+                with span("fit", model=estimator.__name__):
+                    return key, model_cache.fit(data_fingerprint, estimator, params, x_train, y_train)
+            label = f"{estimator.__name__}({', '.join(f'{name}={value}' for name, value in params.items())})"
+            job_id = get_runner().submit(label, key, estimator, params, x_train, y_train)
+            st.session_state.setdefault("training_jobs", {})[job_id] = None
+            st.info("⏳ Training started in the background. Click Classify again once it has finished.")
+            return key, None
+
+        def show_results(key, model, metrics, score_full_dataset=True):
+            # predict and predict_proba (or decision_function) over the test split, skipped altogether
+            # when this model was already evaluated on this split
+            evaluation_key = (key, target_column)
+            with span("evaluate", model=type(model).__name__):
+                evaluation = ChartCache.get_cache().evaluation(
+                    evaluation_key, lambda: Evaluation.EvaluationBundle(model, x_test, y_test, key=evaluation_key))
+            count("classifications", page="ml_lab")
+            st.write("Accuracy: ", round(evaluation.accuracy, 2))
+            st.write("Precision: ", round(evaluation.precision, 2))
+            st.write("Recall: ", round(evaluation.recall, 2))
+            st.write("F1-Score: ", round(evaluation.f1, 2))
+
+            if score_full_dataset and streaming:
+                # Score the whole upload chunk by chunk; only counts and a preview stay in memory
+                progress = st.progress(0.0, text="Scoring chunks...")
+                total_bytes = max(uploaded_file.size, 1)
+                with span("score_chunks", model=type(model).__name__):
+                    summary = ChunkedIngest.score_chunks(uploaded_file, chunk_rows, codec, model, target_column,
+                                           on_chunk=lambda s: progress.progress(min(uploaded_file.tell() / total_bytes, 1.0),
+                                                                                text=f"Scored {s.rows:,} rows in {s.chunks} chunks"))
+                count("rows_scored", summary.rows)
+                st.subheader("Classification Results")
+                st.caption(f"First {len(summary.preview):,} of {summary.rows:,} rows")
+                st.dataframe(summary.preview)
+                if summary.accuracy is not None:
+                    st.write("Agreement with labels across all chunks: ", round(summary.accuracy, 2))
+                edible_count = summary.edible
+                poisonous_count = summary.poisonous
+            elif score_full_dataset:
+                # Define X for predictions
+                X = df.drop(columns=[target_column])  # Drop target_column for predictions
+                with span("predict", model=type(model).__name__):
+                    predictions = model.predict(X)
+                count("rows_scored", len(X))
+                pager = ResultsPager.ResultsPager(data, predictions)
+
+                # Display results
+                st.subheader("Classification Results")
+                results_table(pager)
+
+                # Count edible and poisonous mushrooms
+                edible_count, poisonous_count = pager.counts()
+            else:
+                # Display the count of edible and poisonous mushrooms
+                edible_count = np.sum(evaluation.y_pred == 0)  # Assuming 0 is "edible"
+                poisonous_count = np.sum(evaluation.y_pred == 1)  # Assuming 1 is "poisonous"
+            st.write(f"Number of edible mushrooms: {edible_count}")
+            st.write(f"Number of poisonous mushrooms: {poisonous_count}")
+
+            # Plot metrics
+            plot_metrics(metrics, evaluation, class_names)
+
         st.sidebar.subheader("Choose Classifier:")
         classifier = st.sidebar.selectbox(
             "Classifier",
-            ("Logistic Regression", "Random Forest","Support Vector Machines (SVM)")
+            ("Logistic Regression", "Random Forest","Support Vector Machines (SVM)",
+             "Decision Tree", "K-Nearest Neighbors (KNN)", "Naive Bayes")
         )
+        background = st.sidebar.checkbox("Train in background", False, help="Fit in a worker process and keep using the page meanwhile")
+        sweep = classifier in ("Logistic Regression", "Random Forest", "Support Vector Machines (SVM)") and \
+            st.sidebar.checkbox("Hyperparameter sweep", False, help="Cross-validate many settings in parallel and keep the best")
+
+        def sweep_space():
+            # Search space, parameters fixed during the sweep, and extra parameters for the final fit
+            if classifier == 'Support Vector Machines (SVM)':
+                engine = st.sidebar.radio("SVM engine", FastSvm.ENGINES, key='svm_engine')
+                c_low, c_high = st.sidebar.slider("C range (log10)", -2.0, 2.0, (-1.0, 1.0), key='sweep_C')
+                space = dict(C=HyperparameterSweep.LogRange(10 ** c_low, 10 ** c_high),
+                             kernel=HyperparameterSweep.Choice(st.sidebar.multiselect("Kernels", ("rbf", "linear"), ("rbf", "linear"), key='sweep_kernel')),
+                             gamma=HyperparameterSweep.Choice(st.sidebar.multiselect("Gamma", ("scale", "auto"), ("scale", "auto"), key='sweep_gamma')))
+                if engine == FastSvm.ENGINES[1]:
+                    return FastSvm.ApproximateSVC, space, {}, {}
+                return svm.SVC, space, {}, dict(probability=True)
+            if classifier == 'Logistic Regression':
+                c_low, c_high = st.sidebar.slider("C range (log10)", -2.0, 1.0, (-1.0, 1.0), key='sweep_C_LR')
+                space = dict(C=HyperparameterSweep.LogRange(10 ** c_low, 10 ** c_high),
+                             max_iter=HyperparameterSweep.IntRange(*st.sidebar.slider("Maximum iterations range", 100, 500, (100, 300), key='sweep_max_iter')))
+                return linear_model.LogisticRegression, space, dict(solver='liblinear'), dict(solver='liblinear')
+            space = dict(n_estimators=HyperparameterSweep.IntRange(*st.sidebar.slider("Trees range", 10, 500, (50, 200), key='sweep_n_estimators')),
+                         max_depth=HyperparameterSweep.IntRange(*st.sidebar.slider("Maximum depth range", 1, 20, (3, 15), key='sweep_max_depth')),
+                         bootstrap=HyperparameterSweep.Choice(st.sidebar.multiselect("Bootstrap", (True, False), (True, False), key='sweep_bootstrap')))
+            # One core per forest while the sweep spreads fits across cores
+            return ensemble.RandomForestClassifier, space, dict(n_jobs=1), dict(n_jobs=-1)
+
+        if sweep:
+            st.sidebar.subheader("Sweep Settings")
+            estimator, space, fixed, final = sweep_space()
+            # A Choice left empty leaves nothing to search; Run Sweep stays disabled until it is filled
+            empty = HyperparameterSweep.empty_dimensions(space)
+            if empty:
+                st.sidebar.error(f"Pick at least one value for: {', '.join(empty)}")
+            if st.sidebar.radio("Search", ("Grid", "Random"), key='sweep_search') == "Grid":
+                configs = HyperparameterSweep.grid(space, st.sidebar.slider("Values per range", 2, 6, 3, key='sweep_points'))
+            else:
+                n_samples = st.sidebar.slider("Configurations to sample", 4, 64, 16, key='sweep_samples')
+                configs = [] if empty else HyperparameterSweep.sample(space, n_samples)
+            eta = st.sidebar.slider("Keep 1 in η configurations per round", 2, 4, 3, key='sweep_eta')
+            st.sidebar.caption(f"{len(configs)} configurations")
+            metrics = st.sidebar.multiselect("What metrics to plot?", ('Confusion Matrix', 'ROC Curve', 'Precision-Recall Curve', 'Recall vs Threshold', 'F1-Score vs Threshold'))
+
+            if st.sidebar.button("Run Sweep", key='classify', disabled=not configs):
+                st.subheader(f"{classifier} Hyperparameter Sweep")
+                halving = HyperparameterSweep.SuccessiveHalving(estimator, configs, x_train, y_train, fixed=fixed,
+                                            data_key=data_fingerprint, eta=eta)
+                progress = st.progress(0.0, text="Starting sweep...")
+                leaderboard = st.empty()
+                shown = 0.0
+                with span("sweep", model=estimator.__name__):
+                    for done, (_, rung, _) in enumerate(halving.run(), 1):
+                        progress.progress(done / halving.total_fits, text=f"Round {rung + 1} of {len(halving.budgets)} · {done}/{halving.total_fits} fits")
+                        # Redraw at most four times a second; each redraw resends the whole leaderboard
+                        if time.perf_counter() - shown > 0.25:
+                            leaderboard.dataframe(halving.leaderboard())
+                            shown = time.perf_counter()
+                leaderboard.dataframe(halving.leaderboard())
+
+                best = halving.best()
+                if best is None:
+                    st.warning("No completed trials, so there is no best configuration to train.")
+                else:
+                    st.success(f"Best configuration: {', '.join(f'{name}={value}' for name, value in best.items())}")
+                    key, model = train(estimator, {**best, **final})
+                    if model is not None:
+                        show_results(key, model, metrics)
         
-        if classifier == 'Support Vector Machines (SVM)':
+        if classifier == 'Support Vector Machines (SVM)' and not sweep:
             st.sidebar.subheader("Model Hyperparameters")
+            engine = st.sidebar.radio("SVM engine", FastSvm.ENGINES, key='svm_engine',
+                                      help="The approximate engine fits a linear SVM on Nystroem kernel features with a single held-out calibration; use it for large uploads")
             C = st.sidebar.number_input("C (Regularization Parameter)", 0.1, 10.0, step=0.1, key='C')
             kernel = st.sidebar.radio("Kernel", ("rbf", "linear"), key='kernel')
             gamma = st.sidebar.radio("Gamma (Kernel Coefficient)", ("scale", "auto"), key='gamma')
@@ -158,38 +309,16 @@ def app():
 
             if st.sidebar.button("Classify", key='classify'):
                 st.subheader("Support Vector Machine (SVM) Results")
-                model = SVC(C=C, kernel=kernel, gamma=gamma, probability=True)
-                model.fit(x_train, y_train)
-                y_pred = model.predict(x_test)
-                accuracy = accuracy_score(y_test, y_pred)
-                st.write("Accuracy: ", round(accuracy, 2))
-                st.write("Precision: ", round(precision_score(y_test, y_pred), 2))
-                st.write("Recall: ", round(recall_score(y_test, y_pred), 2))
-                st.write("F1-Score: ", round(f1_score(y_test, y_pred), 2))
-
-                # Define X for predictions
-                X = df.drop(columns=[target_column])  # Drop target_column for predictions
-                all_predictions = model.predict(X)
-                predicted_labels = ["Edible" if pred == 0 else "Poisonous" for pred in all_predictions]
-                results_df = data.copy()
-                results_df['Prediction'] = predicted_labels
-
-                # Display results
-                st.subheader("Classification Results")
-                st.dataframe(results_df)
-
-                # Count edible and poisonous mushrooms
-                edible_count = predicted_labels.count("Edible")
-                poisonous_count = predicted_labels.count("Poisonous")
-                st.write(f"Number of edible mushrooms: {edible_count}")
-                st.write(f"Number of poisonous mushrooms: {poisonous_count}")
-
-                # Plot metrics
-                plot_metrics(metrics, model, x_test, y_test, class_names)
+                if engine == FastSvm.ENGINES[1]:
+                    key, model = train(FastSvm.ApproximateSVC, dict(C=C, kernel=kernel, gamma=gamma))
+                else:
+                    key, model = train(svm.SVC, dict(C=C, kernel=kernel, gamma=gamma, probability=True))
+                if model is not None:
+                    show_results(key, model, metrics)
 
             
 
-        if classifier == 'Logistic Regression':
+        if classifier == 'Logistic Regression' and not sweep:
             st.sidebar.subheader("Model Hyperparameters")
             C = st.sidebar.number_input("C (Regularization parameter)", 0.01, 10.0, step=0.01, key='C_LR')
             max_iter = st.sidebar.slider("Maximum number of iterations", 100, 500, key='max_iter')
@@ -197,36 +326,11 @@ def app():
 
             if st.sidebar.button("Classify", key='classify'):
                 st.subheader("Logistic Regression Results")
-                model = LogisticRegression(C=C, max_iter=max_iter, solver='liblinear')
-                model.fit(x_train, y_train)
-                y_pred = model.predict(x_test)
-                accuracy = accuracy_score(y_test, y_pred)
-                st.write("Accuracy: ", round(accuracy, 2))
-                st.write("Precision: ", round(precision_score(y_test, y_pred), 2))
-                st.write("Recall: ", round(recall_score(y_test, y_pred), 2))
-                st.write("F1-Score: ", round(f1_score(y_test, y_pred), 2))
+                key, model = train(linear_model.LogisticRegression, dict(C=C, max_iter=max_iter, solver='liblinear'))
+                if model is not None:
+                    show_results(key, model, metrics)
 
-                # Define X for predictions
-                X = df.drop(columns=[target_column])  # Drop target_column for predictions
-                all_predictions = model.predict(X)
-                predicted_labels = ["Edible" if pred == 0 else "Poisonous" for pred in all_predictions]
-                results_df = data.copy()
-                results_df['Prediction'] = predicted_labels
-
-                # Display results
-                st.subheader("Classification Results")
-                st.dataframe(results_df)
-
-                # Count edible and poisonous mushrooms
-                edible_count = predicted_labels.count("Edible")
-                poisonous_count = predicted_labels.count("Poisonous")
-                st.write(f"Number of edible mushrooms: {edible_count}")
-                st.write(f"Number of poisonous mushrooms: {poisonous_count}")
-
-                # Plot metrics
-                plot_metrics(metrics, model, x_test, y_test, class_names)
-
-        if classifier == 'Random Forest':
+        if classifier == 'Random Forest' and not sweep:
             st.sidebar.subheader("Model Hyperparameters")
             n_estimators = st.sidebar.number_input("Number of trees in the forest", 100, 5000, step=10, key='n_estimators')
             max_depth = st.sidebar.number_input("Maximum depth of the tree", 1, 20, step=1, key='max_depth')
@@ -235,34 +339,9 @@ def app():
 
             if st.sidebar.button("Classify", key='classify'):
                 st.subheader("Random Forest Results")
-                model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, bootstrap=bootstrap, n_jobs=-1)
-                model.fit(x_train, y_train)
-                y_pred = model.predict(x_test)
-                accuracy = accuracy_score(y_test, y_pred)
-                st.write("Accuracy: ", round(accuracy, 2))
-                st.write("Precision: ", round(precision_score(y_test, y_pred), 2))
-                st.write("Recall: ", round(recall_score(y_test, y_pred), 2))
-                st.write("F1-Score: ", round(f1_score(y_test, y_pred), 2))
-                
-                # Define X for predictions
-                X = df.drop(columns=[target_column])  # Drop target_column for predictions
-                all_predictions = model.predict(X)
-                predicted_labels = ["Edible" if pred == 0 else "Poisonous" for pred in all_predictions]
-                results_df = data.copy()
-                results_df['Prediction'] = predicted_labels
-
-                # Display results
-                st.subheader("Classification Results")
-                st.dataframe(results_df)
-
-                # Count edible and poisonous mushrooms
-                edible_count = predicted_labels.count("Edible")
-                poisonous_count = predicted_labels.count("Poisonous")
-                st.write(f"Number of edible mushrooms: {edible_count}")
-                st.write(f"Number of poisonous mushrooms: {poisonous_count}")
-
-                # Plot metrics
-                plot_metrics(metrics, model, x_test, y_test, class_names)
+                key, model = train(ensemble.RandomForestClassifier, dict(n_estimators=n_estimators, max_depth=max_depth, bootstrap=bootstrap, n_jobs=-1))
+                if model is not None:
+                    show_results(key, model, metrics)
 
         if classifier == 'Decision Tree':
             st.sidebar.subheader("Model Hyperparameters")
@@ -271,22 +350,9 @@ def app():
 
             if st.sidebar.button("Classify", key='classify'):
                 st.subheader("Decision Tree Results")
-                model = DecisionTreeClassifier(max_depth=max_depth)
-                model.fit(x_train, y_train)
-                y_pred = model.predict(x_test)
-                accuracy = accuracy_score(y_test, y_pred)
-                st.write("Accuracy: ", round(accuracy, 2))
-                st.write("Precision: ", round(precision_score(y_test, y_pred), 2))
-                st.write("Recall: ", round(recall_score(y_test, y_pred), 2))
-                st.write("F1-Score: ", round(f1_score(y_test, y_pred), 2))
-
-                # Display the count of edible and poisonous mushrooms
-                edible_count = np.sum(y_pred == 0)  # Assuming 0 is "edible"
-                poisonous_count = np.sum(y_pred == 1)  # Assuming 1 is "poisonous"
-                st.write(f"Number of edible mushrooms: {edible_count}")
-                st.write(f"Number of poisonous mushrooms: {poisonous_count}")
-                
-                plot_metrics(metrics, model, x_test, y_test, class_names)
+                key, model = train(tree.DecisionTreeClassifier, dict(max_depth=max_depth))
+                if model is not None:
+                    show_results(key, model, metrics, score_full_dataset=False)
 
         if classifier == 'K-Nearest Neighbors (KNN)':
             st.sidebar.subheader("Model Hyperparameters")
@@ -295,22 +361,9 @@ def app():
 
             if st.sidebar.button("Classify", key='classify'):
                 st.subheader("K-Nearest Neighbors (KNN) Results")
-                model = KNeighborsClassifier(n_neighbors=n_neighbors)
-                model.fit(x_train, y_train)
-                y_pred = model.predict(x_test)
-                accuracy = accuracy_score(y_test, y_pred)
-                st.write("Accuracy: ", round(accuracy, 2))
-                st.write("Precision: ", round(precision_score(y_test, y_pred), 2))
-                st.write("Recall: ", round(recall_score(y_test, y_pred), 2))
-                st.write("F1-Score: ", round(f1_score(y_test, y_pred), 2))
-
-                # Display the count of edible and poisonous mushrooms
-                edible_count = np.sum(y_pred == 0)  # Assuming 0 is "edible"
-                poisonous_count = np.sum(y_pred == 1)  # Assuming 1 is "poisonous"
-                st.write(f"Number of edible mushrooms: {edible_count}")
-                st.write(f"Number of poisonous mushrooms: {poisonous_count}")
-                
-                plot_metrics(metrics, model, x_test, y_test, class_names)
+                key, model = train(*LowLatencyModels.knn(n_neighbors, categorical))
+                if model is not None:
+                    show_results(key, model, metrics, score_full_dataset=False)
 
         if classifier == 'Naive Bayes':
             st.sidebar.subheader("Model Hyperparameters")
@@ -318,22 +371,12 @@ def app():
 
             if st.sidebar.button("Classify", key='classify'):
                 st.subheader("Naive Bayes Results")
-                model = GaussianNB()
-                model.fit(x_train, y_train)
-                y_pred = model.predict(x_test)
-                accuracy = accuracy_score(y_test, y_pred)
-                st.write("Accuracy: ", round(accuracy, 2))
-                st.write("Precision: ", round(precision_score(y_test, y_pred), 2))
-                st.write("Recall: ", round(recall_score(y_test, y_pred), 2))
-                st.write("F1-Score: ", round(f1_score(y_test, y_pred), 2))
+                key, model = train(*LowLatencyModels.naive_bayes(categorical, [len(codec.vocabularies[col]) for col in x_train.columns]))
+                if model is not None:
+                    show_results(key, model, metrics, score_full_dataset=False)
+
+        training_jobs_panel()
 
-                # Display the count of edible and poisonous mushrooms
-                edible_count = np.sum(y_pred == 0)  # Assuming 0 is "edible"
-                poisonous_count = np.sum(y_pred == 1)  # Assuming 1 is "poisonous"
-                st.write(f"Number of edible mushrooms: {edible_count}")
-                st.write(f"Number of poisonous mushrooms: {poisonous_count}")
-                
-                plot_metrics(metrics, model, x_test, y_test, class_names)
     # Footer with social links
     st.markdown('<div class="footer">Created with ❤️ by Strategic Synergists</div>', unsafe_allow_html=True)
 
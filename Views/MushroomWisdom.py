@@ -1,4 +1,5 @@
 import streamlit as st
+from Services.StaticAssets import set_background
 import base64
 
 
@@ -11,22 +12,7 @@ def app():
         there's something here for everyone!
         </div>
     """, unsafe_allow_html=True)
-    def set_bg_hack_url():
-
-        st.markdown(
-            f"""
-            <style>
-            .stApp {{
-                background: url("https://avi-chavan-96.sirv.com/Mushroom/disc-fungus-8298506_1280.jpg");
-                background-size: 100% 100%;
-                background-position: center;
-                min-height: 100vh; /* Minimum height to cover the full viewport */
-                height: auto; /* Adjust height based on content */
-            }}
-            </style>
-            """,
-            unsafe_allow_html=True)
-    set_bg_hack_url()
+    set_background("wisdom")
 
     # Section 1: Introduction to Mushrooms
     st.header("🍄 Introduction to Mushrooms")